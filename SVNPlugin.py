@@ -11,11 +11,29 @@ from .svn_plugin.commands 		import *
 from .svn_plugin.eventlisteners import *
 from .svn_plugin.reloader 		import *
 from .svn_plugin.svn 			import SVN
+from .svn_plugin.settings 		import Settings
+from .svn_plugin.cache 			import Cache
+from .svn_plugin.scheduler 		import Scheduler
+from .svn_plugin.wc_db 			import WorkingCopyDatabase
+from .svn_plugin.working_copy 	import WorkingCopy
+from .svn_plugin.snapshot 		import Snapshot
 
 def plugin_loaded():
 	settings = sublime.load_settings( 'SVNPlugin.sublime-settings' )
 
 	try:
-		SVN.init( binary = settings.get( 'svn_binary', None ), log_commands = settings.get( 'svn_log_commands', False ) )
+		SVN.init( binary = settings.get( 'svn_binary', None ), log_commands = settings.get( 'svn_log_commands', False ), timeouts = settings.get( 'svn_timeouts', None ) )
 	except Exception as e:
 		sublime.error_message( str( e ) )
+
+	plugin_settings = Settings()
+
+	Scheduler.configure( plugin_settings.svn_max_workers(), plugin_settings.svn_working_copy_workers() )
+	Snapshot.start()
+
+def plugin_unloaded():
+	# saved before anything is closed or cleared
+	Snapshot.stop()
+	WorkingCopy.close_all()
+	WorkingCopyDatabase.close_all()
+	Cache.clear()
@@ -0,0 +1,87 @@
+import array
+
+from .cache import Cache
+
+CACHE_ENTRIES = 8
+
+def split_lines( content ):
+	# svn blame only ends lines at \n, str.splitlines would also split on form feeds and unicode separators
+	lines = [ line + '\n' for line in content.split( '\n' ) ]
+
+	if lines[ -1 ] == '\n':
+		lines.pop()
+	else:
+		lines[ -1 ] = lines[ -1 ][ : -1 ]
+
+	return lines
+
+class Annotation():
+	def __init__( self, lines ):
+		self.lines 			= lines
+		self.revisions		= array.array( 'l' )
+		self.author_ids		= array.array( 'l' )
+		self.authors		= []
+		self.author_index	= dict()
+		self.metadata		= dict()
+
+	def add( self, revision, author ):
+		if author not in self.author_index:
+			self.author_index[ author ] = len( self.authors )
+			self.authors.append( author )
+
+		self.revisions.append( revision )
+		self.author_ids.append( self.author_index[ author ] )
+
+	def revision_at( self, line ):
+		revision = self.revisions[ line ]
+
+		return None if revision == -1 else revision
+
+	def author_at( self, line ):
+		return self.authors[ self.author_ids[ line ] ]
+
+	def entry_at( self, line ):
+		return self.metadata.get( self.revision_at( line ) )
+
+	def distinct_revisions( self ):
+		return sorted( set( self.revisions ) - set( [ -1 ] ) )
+
+	def __len__( self ):
+		return min( len( self.lines ), len( self.revisions ) )
+
+	def format( self ):
+		output = []
+
+		for line in range( len( self ) ):
+			revision	= self.revision_at( line )
+			author		= self.author_at( line )
+
+			output.append( '{0:>6} {1:>10.10} {2}' . format( '-' if revision is None else revision, '-' if author is None else author, self.lines[ line ] ) )
+
+		return ''.join( output )
+
+annotation_cache = Cache.region( 'annotations', max_entries = CACHE_ENTRIES )
+
+class AnnotationView():
+	views = dict()
+
+	@classmethod
+	def summary( cls, view ):
+		annotation = cls.views.get( view.id() )
+
+		if annotation is None or not view.sel():
+			return None
+
+		line = view.rowcol( view.sel()[ 0 ].begin() )[ 0 ]
+
+		if line >= len( annotation ):
+			return None
+
+		entry = annotation.entry_at( line )
+
+		if entry is None:
+			return None
+
+		message = entry.msg.strip().split( '\n' )[ 0 ]
+
+		return 'r{0} | {1} | {2}' . format( entry.revision, entry.author, message )
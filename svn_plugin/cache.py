@@ -1,4 +1,209 @@
+import os
+import time
+import bisect
+import threading
+import collections
+
+MISSING = object()
+
+class CacheRegion():
+	def __init__( self, name, max_entries = None, max_size = None, ttl = None, weigh = None, paths = False ):
+		self.name			= name
+		self.max_entries	= max_entries
+		self.max_size		= max_size
+		self.ttl			= ttl
+		self.weigh			= weigh
+		self.paths			= paths
+		self.path_keys		= []
+		self.entries		= collections.OrderedDict()
+		self.size			= 0
+		self.lock			= threading.RLock()
+		self.hits			= 0
+		self.misses			= 0
+		self.evictions		= 0
+		self.expirations	= 0
+
+	def get( self, key, default = None ):
+		with self.lock:
+			entry = self.entries.get( key )
+
+			if entry is not None and entry[ 1 ] is not None and entry[ 1 ] <= time.time():
+				self.expirations += 1
+				self.discard( key )
+				entry = None
+
+			if entry is None:
+				self.misses += 1
+				return default
+
+			self.hits += 1
+			self.entries.move_to_end( key )
+
+			return entry[ 0 ]
+
+	def lookup( self, key ):
+		# expired entries are returned as well, for callers that can use an old answer while a new one is found
+		with self.lock:
+			entry = self.entries.get( key )
+
+			if entry is None:
+				self.misses += 1
+				return MISSING, False
+
+			fresh = entry[ 1 ] is None or entry[ 1 ] > time.time()
+
+			if fresh:
+				self.hits += 1
+			else:
+				self.misses += 1
+
+			self.entries.move_to_end( key )
+
+			return entry[ 0 ], fresh
+
+	def put( self, key, value, ttl = MISSING ):
+		ttl = self.ttl if ttl is MISSING else ttl
+
+		with self.lock:
+			self.discard( key )
+
+			weight 				= self.weigh( value ) if self.weigh is not None else 0
+			self.entries[ key ] = ( value, time.time() + ttl if ttl is not None else None, weight )
+			self.size			+= weight
+
+			if self.paths:
+				bisect.insort( self.path_keys, key )
+
+			self.evict()
+
+		return value
+
+	def contains( self, key ):
+		return self.get( key, MISSING ) is not MISSING
+
+	def invalidate( self, key ):
+		with self.lock:
+			self.discard( key )
+
+	def invalidate_where( self, predicate ):
+		with self.lock:
+			for key in [ key for key in self.entries if predicate( key ) ]:
+				self.discard( key )
+
+	def invalidate_path( self, path ):
+		self.invalidate_paths( [ path ] )
+
+	def invalidate_paths( self, paths ):
+		with self.lock:
+			for key in self.keys_under( paths ):
+				self.discard( key )
+
+	def expire_paths( self, paths ):
+		# expired entries stay around for lookup, so callers keep the old answer until they have a new one
+		with self.lock:
+			for key in self.keys_under( paths ):
+				value, expires, weight = self.entries[ key ]
+				self.entries[ key ] 	= ( value, 0, weight )
+
+	def keys_under( self, paths ):
+		if not self.paths:
+			return []
+
+		keys = []
+
+		# keys are kept sorted, so a path and everything below it are two short runs of them
+		for path in paths:
+			path	= os.path.normpath( path )
+			prefix	= path.rstrip( os.sep ) + os.sep
+			index	= bisect.bisect_left( self.path_keys, prefix )
+
+			if path in self.entries:
+				keys.append( path )
+
+			while index < len( self.path_keys ) and self.path_keys[ index ].startswith( prefix ):
+				keys.append( self.path_keys[ index ] )
+				index += 1
+
+		return keys
+
+	def clear( self ):
+		with self.lock:
+			self.entries.clear()
+			self.size 		= 0
+			self.path_keys	= []
+
+	def discard( self, key ):
+		entry = self.entries.pop( key, None )
+
+		if entry is not None:
+			self.forget( key, entry )
+
+	def forget( self, key, entry ):
+		self.size -= entry[ 2 ]
+
+		if self.paths:
+			index = bisect.bisect_left( self.path_keys, key )
+
+			if index < len( self.path_keys ) and self.path_keys[ index ] == key:
+				del self.path_keys[ index ]
+
+	def evict( self ):
+		while self.entries and ( ( self.max_entries is not None and len( self.entries ) > self.max_entries ) or ( self.max_size is not None and self.size > self.max_size ) ):
+			key, entry = self.entries.popitem( last = False )
+
+			self.forget( key, entry )
+			self.evictions += 1
+
+	def items( self ):
+		now = time.time()
+
+		with self.lock:
+			return [ ( key, entry[ 0 ] ) for key, entry in self.entries.items() if entry[ 1 ] is None or entry[ 1 ] > now ]
+
+	def stats( self ):
+		with self.lock:
+			return { 'entries': len( self.entries ), 'size': self.size, 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'expirations': self.expirations }
+
+	def __len__( self ):
+		return len( self.entries )
+
 class Cache():
-	cached_files = dict()
-	folders = dict()
-	svns	= dict()
+	regions	= dict()
+	lock	= threading.Lock()
+
+	@classmethod
+	def region( cls, name, max_entries = None, max_size = None, ttl = None, weigh = None, paths = False ):
+		with cls.lock:
+			region = cls.regions.get( name )
+
+			if region is None:
+				return cls.regions.setdefault( name, CacheRegion( name, max_entries, max_size, ttl, weigh, paths ) )
+
+			# a region is set up by whoever creates it, later calls only look it up
+			if ( max_entries, max_size, ttl, paths ) != ( None, None, None, False ) and ( max_entries, max_size, ttl, paths ) != ( region.max_entries, region.max_size, region.ttl, region.paths ):
+				raise ValueError( 'Cache region {0} already exists with different limits' . format( name ) )
+
+			return region
+
+	@classmethod
+	def invalidate_path( cls, path ):
+		cls.invalidate_paths( [ path ] )
+
+	@classmethod
+	def invalidate_paths( cls, paths ):
+		for region in cls.all_regions():
+			region.invalidate_paths( paths )
+
+	@classmethod
+	def clear( cls ):
+		for region in cls.all_regions():
+			region.clear()
+
+	@classmethod
+	def stats( cls ):
+		return dict( [ ( region.name, region.stats() ) for region in cls.all_regions() ] )
+
+	@classmethod
+	def all_regions( cls ):
+		with cls.lock:
+			return list( cls.regions.values() )
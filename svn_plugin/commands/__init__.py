@@ -4,6 +4,8 @@ from .svn_add		import SvnPluginFolderAddCommand
 
 from .svn_annotate	import SvnPluginFileAnnotateCommand
 
+from .svn_cancel	import SvnPluginCancelCommand
+
 from .svn_commit	import SvnPluginCommitCommand
 from .svn_commit	import SvnPluginFileCommitCommand
 from .svn_commit	import SvnPluginFolderCommitCommand
@@ -20,6 +22,8 @@ from .svn_log 		import SvnPluginLogCommand
 from .svn_log 		import SvnPluginFileLogCommand
 from .svn_log 		import SvnPluginFolderLogCommand
 
+from .svn_panel	import SvnPluginReplaceContentCommand
+
 from .svn_status	import SvnPluginStatusCommand
 from .svn_status	import SvnPluginFileStatusCommand
 from .svn_status	import SvnPluginFolderStatusCommand
@@ -35,6 +39,8 @@ __all__ = [
 
 	'SvnPluginFileAnnotateCommand',
 
+	'SvnPluginCancelCommand',
+
 	'SvnPluginCommitCommand',
 	'SvnPluginFileCommitCommand',
 	'SvnPluginFolderCommitCommand',
@@ -51,6 +57,8 @@ __all__ = [
 	'SvnPluginFileLogCommand',
 	'SvnPluginFolderLogCommand',
 
+	'SvnPluginReplaceContentCommand',
+
 	'SvnPluginStatusCommand',
 	'SvnPluginFileStatusCommand',
 	'SvnPluginFolderStatusCommand',
@@ -4,41 +4,47 @@ from ..cache				import Cache
 from ..utils				import in_svn_root, find_svn_root, SvnPluginCommand
 from ..settings 			import Settings
 from ..repository 			import Repository
+from ..result				import Result
 
 class SvnPluginAddCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 	def run( self, path = None ):
+		file_path = self.get_file()
+
+		self.run_async( 'Adding {0}' . format( path or file_path ), lambda: self.add( path, file_path ), self.add_callback )
+
+	def add( self, path, file_path ):
 		if path is None:
-			path = find_svn_root( self.get_file() )
+			path = find_svn_root( file_path )
 
 			if path is None:
-				return
+				return None
+
+		repository = Repository( path )
 
-		self.repository = Repository( path )
+		if repository.is_tracked():
+			return Result.failure( '{0} is already under version control' . format( path ) )
 
-		if self.repository.is_tracked():
-			return sublime.error_message( '{0} is already under version control' . format( path ) )
+		return repository.add()
+
+	def add_callback( self, result ):
+		if result is None:
+			return
 
-		if not self.repository.add():
-			return sublime.error_message( self.repository.svn_error )
+		if not result:
+			return sublime.error_message( result.error )
 
-		sublime.status_message( '{0} added' . format( path ) )
+		sublime.status_message( '{0} added' . format( result.args[ -1 ] ) )
 
 class SvnPluginFileAddCommand( SvnPluginAddCommand ):
 	def run( self ):
-		if not in_svn_root( self.get_file() ):
-			return
-
-		self.window.run_command( 'svn_plugin_add', { 'path': self.get_file() } )
+		self.run_in_svn_root( 'svn_plugin_add', self.get_file() )
 
 	def is_visible( self ):
 		return in_svn_root( self.get_file() )
 
 class SvnPluginFolderAddCommand( SvnPluginAddCommand ):
 	def run( self ):
-		if not in_svn_root( self.get_folder() ):
-			return
-
-		self.window.run_command( 'svn_plugin_add', { 'path': self.get_folder() } )
+		self.run_in_svn_root( 'svn_plugin_add', self.get_folder() )
 
 	def is_visible( self ):
 		return in_svn_root( self.get_folder() )
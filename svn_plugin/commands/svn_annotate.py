@@ -5,19 +5,23 @@ from ..utils					import in_svn_root, SvnPluginCommand
 from ..repository 				import Repository
 from ..thread_progress 			import ThreadProgress
 from ..threads.annotate_file	import AnnotateFileThread
+from ..annotation				import AnnotationView
 
 class SvnPluginFileAnnotateCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 	def run( self, path = None, revision = None ):
 		if path is None:
 			path = self.get_file()
 
-			if not in_svn_root( path ):
-				return
+		self.run_async( 'Checking {0}' . format( path ), lambda: self.tracked_repository( path ), lambda result: self.check_callback( result, revision ) )
 
-		self.repository = Repository( path )
+	def check_callback( self, result, revision ):
+		if result is None:
+			return
 
-		if not self.repository.is_tracked():
-			return sublime.error_message( '{0} is not under version control' . format( path ) )
+		if not result:
+			return sublime.error_message( result.error )
+
+		self.repository = result.payload
 
 		thread = AnnotateFileThread( self.repository, revision = revision, on_complete = self.annotate_callback )
 		thread.start()
@@ -25,15 +29,19 @@ class SvnPluginFileAnnotateCommand( sublime_plugin.WindowCommand, SvnPluginComma
 
 	def annotate_callback( self, result ):
 		if not result:
-			return sublime.error_message( self.repository.svn_error )
+			return sublime.error_message( result.error )
+
+		annotation = result.payload
 
 		current_syntax	= self.window.active_view().settings().get( 'syntax' )
 		view 			= self.window.new_file()
 
+		AnnotationView.views[ view.id() ] = annotation
+
 		view.set_name( 'SVNPlugin: Annotation' )
 		view.assign_syntax( current_syntax )
 		view.set_scratch( True )
-		view.run_command( 'append', { 'characters': self.repository.svn_output } )
+		view.run_command( 'append', { 'characters': annotation.format() } )
 		view.set_read_only( True )
 
 	def is_visible( self ):
@@ -0,0 +1,32 @@
+import sublime, sublime_plugin
+
+from ..operation import Operation
+
+class SvnPluginCancelCommand( sublime_plugin.WindowCommand ):
+	def run( self, all = False ):
+		self.operations = Operation.running()
+
+		if not self.operations:
+			return sublime.status_message( 'No SVN operation is running' )
+
+		if all or len( self.operations ) == 1:
+			for operation in self.operations:
+				operation.cancel()
+
+			return sublime.status_message( 'Cancelling {0}' . format( ', ' . join( [ operation.name for operation in self.operations ] ) ) )
+
+		self.window.show_quick_panel( [ 'Cancel all' ] + [ operation.name for operation in self.operations ], self.cancel_callback )
+
+	def cancel_callback( self, index ):
+		if index == -1:
+			return
+
+		operations = self.operations if index == 0 else [ self.operations[ index - 1 ] ]
+
+		for operation in operations:
+			operation.cancel()
+
+		sublime.status_message( 'Cancelling {0}' . format( ', ' . join( [ operation.name for operation in operations ] ) ) )
+
+	def is_enabled( self ):
+		return len( Operation.running() ) > 0
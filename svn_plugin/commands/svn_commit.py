@@ -1,14 +1,11 @@
 import sublime, sublime_plugin
 
 import re
-import xml.etree.ElementTree as ET
 import os.path
 import tempfile
 
-from ..thread_progress	import ThreadProgress
-from ..repository 		import Repository
 from ..settings 		import Settings
-from ..utils			import in_svn_root, find_svn_root, SvnPluginCommand
+from ..utils			import in_svn_root, SvnPluginCommand
 from ..cache			import Cache
 
 EDITOR_EOF_PREFIX = '--This line, and those below, will be ignored--\n'
@@ -20,38 +17,26 @@ class SvnPluginCommitCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 		self.__error 			= ''
 
 	def run( self, path = None ):
-		if path is None:
-			path = find_svn_root( self.get_file() )
+		file_path = self.get_file()
 
-			if path is None:
-				return
+		self.run_async( 'Loading changes', lambda: self.changes( path, file_path ), self.changes_callback )
 
-		repository = Repository( path )
+	def changes( self, path, file_path ):
+		result = self.tracked_repository( path, file_path )
 
-		if not repository.is_tracked():
-			return sublime.error_message( '{0} is not under version control' . format( path ) )
+		if not result:
+			return result
 
-		if not repository.status():
-			return sublime.error_message( repository.error )
+		return result.payload.changes()
 
-		output 	= repository.svn_output
-		files 	= []
-
-		try:
-			root = ET.fromstring( output )
-		except ET.ParseError:
-			return sublime.error_message( 'Failed to parse XML' )
-
-		try:
-			for child in root.iter( 'entry' ):
-				entry_path	= child.attrib[ 'path' ]
-				item_status = child.find( 'wc-status' ).attrib[ 'item' ]
+	def changes_callback( self, changes ):
+		if changes is None:
+			return
 
-				if item_status == 'added' or item_status == 'modified' or item_status == 'deleted' or item_status == 'replaced':
-					files.append( { 'path': entry_path, 'status': item_status[ :1 ].upper() } )
+		if not changes:
+			return sublime.error_message( changes.error )
 
-		except KeyError as e:
-			return sublime.error_message( 'Failed to find key {0}' . format( str( e ) ) )
+		files = [ { 'path': change.path, 'status': change.item[ :1 ].upper() } for change in changes.payload if change.item in ( 'added', 'modified', 'deleted', 'replaced' ) ]
 
 		if not files:
 			return sublime.message_dialog( 'No files to commit' )
@@ -110,20 +95,14 @@ class SvnPluginCommitCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 
 class SvnPluginFileCommitCommand( SvnPluginCommitCommand ):
 	def run( self ):
-		if not in_svn_root( self.get_file() ):
-			return
-
-		self.window.run_command( 'svn_plugin_commit', { 'path': self.get_file() } )
+		self.run_in_svn_root( 'svn_plugin_commit', self.get_file() )
 
 	def is_visible( self ):
 		return in_svn_root( self.get_file() )
 
 class SvnPluginFolderCommitCommand( SvnPluginCommitCommand ):
 	def run( self ):
-		if not in_svn_root( self.get_folder() ):
-			return
-
-		self.window.run_command( 'svn_plugin_commit', { 'path': self.get_folder() } )
+		self.run_in_svn_root( 'svn_plugin_commit', self.get_folder() )
 
 	def is_visible( self ):
 		return in_svn_root( self.get_folder() )
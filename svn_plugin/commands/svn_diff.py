@@ -1,49 +1,52 @@
 import sublime, sublime_plugin
 
 from ..cache				import Cache
-from ..utils				import in_svn_root, find_svn_root, SvnPluginCommand
+from ..utils				import in_svn_root, SvnPluginCommand
 from ..settings 			import Settings
-from ..repository 			import Repository
 from ..thread_progress 		import ThreadProgress
 from ..threads.diff_path 	import DiffPathThread
+from ..result				import Result
 
 class SvnPluginDiffCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 	def run( self, path = None, revision = None, change = None ):
-		if path is None:
-			path = find_svn_root( self.get_file() )
+		file_path = self.get_file()
 
-			if path is None:
-				return
+		self.run_async( 'Checking {0}' . format( path or file_path ), lambda: self.check( path, file_path, revision, change ), lambda result: self.check_callback( result, revision, change ) )
 
-		self.repository = Repository( path )
+	def check( self, path, file_path, revision, change ):
+		result = self.tracked_repository( path, file_path )
 
-		if not self.repository.is_tracked():
-			return sublime.error_message( '{0} is not under version control' . format( path ) )
+		if result and revision is None and change is None and not result.payload.is_modified():
+			return Result.failure( '{0} has not been modified' . format( result.payload.path ) )
 
-		if revision is None and change is None:
-			if not self.repository.is_modified():
-				return sublime.error_message( '{0} has not been modified' . format( path ) )
+		return result
+
+	def check_callback( self, result, revision, change ):
+		if result is None:
+			return
+
+		if not result:
+			return sublime.error_message( result.error )
+
+		self.repository = result.payload
 
 		thread = DiffPathThread( self.repository, revision, change, Settings().svn_diff_tool(), self.diff_callback )
 		thread.start()
-		ThreadProgress( thread, 'Running diff on {0}' . format( path ) )
+		ThreadProgress( thread, 'Running diff on {0}' . format( self.repository.path ) )
 
 	def diff_callback( self, result ):
 		if not result:
-			return sublime.error_message( self.repository.error )
+			return sublime.error_message( result.error )
 
-		if self.repository.svn_output:
-			self.window.new_file().run_command( 'append', { 'characters': self.repository.svn_output } )
+		if result.output:
+			self.window.new_file().run_command( 'append', { 'characters': result.output } )
 
 	def is_visible( self ):
 		return in_svn_root( self.window.active_view().file_name() )
 
 class SvnPluginFileDiffCommand( SvnPluginDiffCommand ):
-	def run( self, ):
-		if not in_svn_root( self.get_file() ):
-			return
-
-		self.window.run_command( 'svn_plugin_diff', { 'path': self.get_file() } )
+	def run( self ):
+		self.run_in_svn_root( 'svn_plugin_diff', self.get_file() )
 
 	def is_visible( self ):
 		return in_svn_root( self.get_file() )
@@ -51,10 +54,7 @@ class SvnPluginFileDiffCommand( SvnPluginDiffCommand ):
 
 class SvnPluginFolderDiffCommand( SvnPluginDiffCommand ):
 	def run( self ):
-		if not in_svn_root( self.get_folder() ):
-			return
-
-		self.window.run_command( 'svn_plugin_diff', { 'path': self.get_folder() } )
+		self.run_in_svn_root( 'svn_plugin_diff', self.get_folder() )
 
 	def is_visible( self ):
 		return in_svn_root( self.get_folder() )
@@ -2,7 +2,6 @@ import sublime, sublime_plugin
 
 import os
 import datetime
-import xml.etree.ElementTree as ET
 
 from ..cache						import Cache
 from ..utils						import in_svn_root, find_svn_root, SvnPluginCommand
@@ -12,19 +11,28 @@ from ..thread_progress 				import ThreadProgress
 from ..threads.revision_file 		import RevisionFileThread
 from ..threads.annotate_file 		import AnnotateFileThread
 from ..threads.revision_list_load 	import RevisionListLoadThread
+from ..threads.revision_prefetch 	import RevisionPrefetchThread
+from ..result						import Result
+
+PREVIEW_DELAY = 50
 
 class SvnPluginInfoCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 	def run( self, path = None ):
 		if path is None:
-			path = find_svn_root( self.get_file() )
+			file_path = self.get_file()
 
-			if path is None:
-				return
+			return self.run_async( 'Checking {0}' . format( file_path ), lambda: find_svn_root( file_path ), self.root_callback )
 
 		self.settings				= Settings()
 		self.repository				= None
 		self.commit_panel			= None
+		self.prefetch_thread		= None
+		self.highlighted			= None
+		self.preview_pending		= False
 		self.previous				= []
+		self.revisions				= []
+		self.revisions_page_size	= 0
+		self.more_revisions			= False
 		self.__error				= ''
 
 		if os.path.isdir( path ):
@@ -32,23 +40,20 @@ class SvnPluginInfoCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 		elif os.path.isfile( path ):
 			return self.file_quick_panel( path )
 
+	def root_callback( self, path ):
+		if path is not None:
+			self.run( path )
+
 	def directory_quick_panel( self, path ):
 		self.repository = Repository( path )
 
-		if not self.repository.ls():
-			return sublime.error_message( self.repository.svn_error )
-
-		try:
-			root = ET.fromstring( self.repository.svn_output )
-		except ET.ParseError:
-			return self.log_error( 'Failed to parse XML' )
+		self.run_async( 'Listing {0}' . format( path ), self.repository.list_entries, lambda list_entries: self.directory_list_callback( path, list_entries ) )
 
-		entries = []
+	def directory_list_callback( self, path, list_entries ):
+		if not list_entries:
+			return sublime.error_message( list_entries.error )
 
-		for entry in root.getiterator( 'entry' ):
-			kind = entry.get( 'kind' )
-
-			entries.append( { 'kind': kind, 'path': os.path.join( path, entry.findtext( 'name' ) ) } )
+		entries = [ { 'kind': entry.kind, 'path': os.path.join( path, entry.name ) } for entry in list_entries.payload ]
 
 		entries 			= sorted( entries, key = lambda k: k[ 'kind' ] )
 		formatted_entries	= [ entry[ 'path' ] for entry in entries ]
@@ -81,12 +86,24 @@ class SvnPluginInfoCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 		if self.repository is None or self.repository.path != file_path:
 			self.repository = Repository( file_path )
 
-		if not self.repository.is_tracked():
+		repository = self.repository
+
+		self.run_async( 'Checking {0}' . format( file_path ), lambda: self.file_state( repository ), lambda state: self.file_state_callback( file_path, state ) )
+
+	def file_state( self, repository ):
+		tracked = bool( repository.is_tracked() )
+
+		return Result.local( payload = ( tracked, tracked and repository.is_modified() ) )
+
+	def file_state_callback( self, file_path, state ):
+		tracked, modified = state.payload
+
+		if not tracked:
 			top_level_file_entries = [ { 'code': 'af', 'value': 'Add File to Repository' } ]
 		else:
 			top_level_file_entries = [ { 'code': 'vr', 'value': 'Revisions' } ]
 
-			if self.repository.is_modified():
+			if modified:
 				top_level_file_entries.extend( [ { 'code': 'cf', 'value': 'Commit' }, { 'code': 'rf', 'value': 'Revert' }, { 'code': 'df', 'value': 'Diff' } ] )
 
 		formatted_entries = [ entry[ 'value' ] for entry in top_level_file_entries ]
@@ -125,8 +142,11 @@ class SvnPluginInfoCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 		if not sublime.ok_cancel_dialog( 'Are you sure you want to revert file:\n\n{0}' . format( self.repository.path ), 'Yes, revert' ):
 			return sublime.status_message( 'File not reverted' )
 
-		if not self.repository.revert():
-			return sublime.error_message( self.repository.error )
+		self.run_async( 'Reverting {0}' . format( self.repository.path ), self.repository.revert, self.file_revert_callback )
+
+	def file_revert_callback( self, result ):
+		if not result:
+			return sublime.error_message( result.error )
 
 		return sublime.status_message( 'File reverted' )
 
@@ -137,32 +157,48 @@ class SvnPluginInfoCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 		return self.window.run_command( 'svn_plugin_diff', { 'path': self.repository.path, 'revision': revision, 'change': change } )
 
 	def file_revisions( self ):
-		thread = RevisionListLoadThread( self.repository, log_limit = self.settings.svn_log_limit(), stop_on_copy = self.settings.svn_stop_on_copy(), revision = None, on_complete = self.file_revisions_callback )
+		self.revisions 		= []
+		self.more_revisions	= False
+
+		self.load_revisions()
+
+	def load_revisions( self ):
+		log_limit					= self.settings.svn_log_limit()
+		before						= int( self.revisions[ -1 ][ 'number' ] ) if self.revisions else None
+		self.revisions_page_size	= self.settings.svn_log_page_size()
+
+		if log_limit:
+			self.revisions_page_size = min( self.revisions_page_size, log_limit - len( self.revisions ) )
+
+		thread = RevisionListLoadThread( self.repository, log_limit = self.revisions_page_size, stop_on_copy = self.settings.svn_stop_on_copy(), revision = before, on_complete = self.file_revisions_callback )
 		thread.start()
 		ThreadProgress( thread, 'Loading revisions' )
 
 	def file_revisions_callback( self, result ):
 		if not result:
-			return sublime.error_message( self.repository.error )
+			return sublime.error_message( result.error )
 
-		date_format = '%Y-%m-%dT%H:%M:%S.%fZ'
+		entries = result.payload
 
-		try:
-			root = ET.fromstring( self.repository.svn_output )
-		except ET.ParseError:
-			return self.log_error( 'Failed to parse XML' )
+		date_format 	= '%Y-%m-%dT%H:%M:%S.%fZ'
+		revisions		= self.revisions
+		selected_index	= min( len( revisions ) + 1, len( revisions ) + len( entries ) ) if revisions else -1
+		log_limit		= self.settings.svn_log_limit()
 
-		revisions = []
-
-		for child in root.getiterator( 'logentry' ):
+		for entry in entries:
 			try:
-				date = datetime.datetime.strptime( child.findtext( 'date', '' ), date_format ).replace( tzinfo = datetime.timezone.utc ).astimezone( tz = None ).strftime( '%a %b %d, %Y @ %I:%M %p' )
+				date = datetime.datetime.strptime( entry.date, date_format ).replace( tzinfo = datetime.timezone.utc ).astimezone( tz = None ).strftime( '%a %b %d, %Y @ %I:%M %p' )
 			except ValueError:
 				date = 'N/A'
 
-			revisions.append( { 'number': child.get( 'revision', '' ), 'author': child.findtext( 'author', '' ), 'date': date, 'message': child.findtext( 'msg', '' ) } )
+			revisions.append( { 'number': str( entry.revision ), 'author': entry.author, 'date': date, 'message': entry.msg, 'paths': entry.paths } )
+
+		self.more_revisions = len( entries ) == self.revisions_page_size and ( not log_limit or len( revisions ) < log_limit )
+
+		if not revisions:
+			return sublime.message_dialog( 'No revisions found' )
 
-		self.revisions_quick_panel( revisions )
+		self.revisions_quick_panel( revisions, selected_index = selected_index )
 
 	def file_annotate( self, revision ):
 		return self.window.run_command( 'svn_plugin_file_annotate', { 'path': self.repository.path, 'revision': revision } )
@@ -174,7 +210,7 @@ class SvnPluginInfoCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 
 	def file_revision_callback( self, result ):
 		if not result:
-			return sublime.error_message( self.repository.error )
+			return sublime.error_message( result.error )
 
 		current_syntax	= self.window.active_view().settings().get( 'syntax' )
 		view 			= self.window.new_file()
@@ -182,7 +218,7 @@ class SvnPluginInfoCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 		view.set_name( 'SVNPlugin: Revision' )
 		view.set_syntax_file( current_syntax )
 		view.set_scratch( True )
-		view.run_command( 'append', { 'characters': self.repository.svn_output } )
+		view.run_command( 'append', { 'characters': result.output } )
 		view.set_read_only( True )
 
 
@@ -192,21 +228,37 @@ class SvnPluginInfoCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 		for revision in revisions:
 			revisions_formatted.extend( [ 'r{0} | {1} | {2}' . format( revision[ 'number' ], revision[ 'author' ], revision[ 'date' ] ) ] )
 
+		if self.more_revisions:
+			revisions_formatted.append( 'Load older revisions…' )
+
 		self.show_quick_panel( revisions_formatted, lambda index: self.revisions_quick_panel_callback( revisions, index ), lambda index: self.revision_highlight( revisions, index ), selected_index = selected_index )
 
 	def revisions_quick_panel_callback( self, revisions, index ):
 		self.hide_panel()
 
 		if index == -1:
+			if self.prefetch_thread is not None:
+				self.prefetch_thread.cancel()
+
 			return
 		elif index == 0:
 			return self.file_quick_panel( self.repository.path )
+		elif index == len( revisions ) + 1:
+			return self.load_revisions()
 
 		offset				= 1
 		revision_index 		= index - offset
-		entries 			= [ { 'code': 'up', 'value': '..' }, { 'code': 'vf', 'value': 'View' }, { 'code': 'af', 'value': 'Annotate' }, { 'code': 'df_c', 'value': 'Diff Changes in this Commit' } ]
 
-		if revision_index != 0 or self.repository.is_modified(): # only show diff option if the current revision has been modified locally or it's an older revision
+		# only show diff option if the current revision has been modified locally or it's an older revision
+		if revision_index != 0:
+			return self.revision_actions_quick_panel( revisions, revision_index, True )
+
+		self.run_async( 'Checking {0}' . format( self.repository.path ), self.repository.is_modified, lambda modified: self.revision_actions_quick_panel( revisions, revision_index, modified ) )
+
+	def revision_actions_quick_panel( self, revisions, revision_index, diff ):
+		entries = [ { 'code': 'up', 'value': '..' }, { 'code': 'vf', 'value': 'View' }, { 'code': 'af', 'value': 'Annotate' }, { 'code': 'df_c', 'value': 'Diff Changes in this Commit' } ]
+
+		if diff:
 			entries.insert( 3, { 'code': 'df', 'value': 'Diff Against HEAD' } )
 
 		self.show_quick_panel( [ entry[ 'value' ] for entry in entries ], lambda index: self.revision_action_callback( entries, revisions, revision_index, index ) )
@@ -234,26 +286,73 @@ class SvnPluginInfoCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 	def revision_highlight( self, revisions, index ):
 		if index == -1:
 			return
-		elif index == 0:
+
+		# holding an arrow key highlights every revision on the way, only the last one is shown
+		self.highlighted = ( revisions, index )
+
+		if not self.preview_pending:
+			self.preview_pending = True
+			sublime.set_timeout( self.preview_highlighted, PREVIEW_DELAY )
+
+	def preview_highlighted( self ):
+		self.preview_pending = False
+
+		if self.highlighted is None:
+			return
+
+		revisions, index = self.highlighted
+
+		if index == 0 or index == len( revisions ) + 1:
 			return self.show_panel( None )
 
 		offset 		= 1
 		revision	= revisions[ index - offset ]
 
-		self.show_panel( revision[ 'message' ] )
+		self.show_panel( self.revision_preview( revision ) )
+		self.prefetch_revisions( revisions, index - offset )
+
+	def revision_preview( self, revision ):
+		lines = [ revision[ 'message' ] ]
+
+		if revision[ 'paths' ]:
+			lines.extend( [ '', 'Changed paths:' ] )
+
+			for path in revision[ 'paths' ]:
+				if path.copyfrom_path:
+					lines.append( '   {0} {1} (from {2}:{3})' . format( path.action, path.path, path.copyfrom_path, path.copyfrom_rev ) )
+				else:
+					lines.append( '   {0} {1}' . format( path.action, path.path ) )
+
+		return '\n' . join( lines )
+
+	def prefetch_revisions( self, revisions, revision_index ):
+		# only what is around the highlighted revision is worth fetching, anything still loading for an earlier one is dropped
+		if self.prefetch_thread is not None:
+			self.prefetch_thread.cancel()
+
+		numbers = [ revisions[ index ][ 'number' ] for index in ( revision_index, revision_index + 1, revision_index - 1 ) if 0 <= index < len( revisions ) ]
+
+		self.prefetch_thread = RevisionPrefetchThread( self.repository, numbers, diff = self.settings.svn_diff_tool() is None )
+		self.prefetch_thread.start()
 
 	def show_quick_panel( self, entries, on_select, on_highlight = None, selected_index = -1 ):
 		sublime.set_timeout( lambda: self.window.show_quick_panel( entries, on_select, flags = sublime.KEEP_OPEN_ON_FOCUS_LOST, on_highlight = on_highlight, selected_index = selected_index ), 10 )
 
 	def show_panel( self, content ):
-		if self.settings.svn_log_panel():
-			self.commit_panel = self.window.create_output_panel( 'svn_panel' )
-			self.window.run_command( 'show_panel', { 'panel': 'output.svn_panel' } )
-			self.commit_panel.set_read_only( False )
-			self.commit_panel.run_command( 'append', { 'characters': content } )
+		if not self.settings.svn_log_panel():
+			return
+
+		# the panel is shown once and then only has its content replaced
+		if self.commit_panel is None:
+			self.commit_panel = self.window.find_output_panel( 'svn_panel' ) or self.window.create_output_panel( 'svn_panel' )
 			self.commit_panel.set_read_only( True )
+			self.window.run_command( 'show_panel', { 'panel': 'output.svn_panel' } )
+
+		self.commit_panel.run_command( 'svn_plugin_replace_content', { 'characters': content or '' } )
 
 	def hide_panel( self ):
+		self.highlighted = None
+
 		if self.commit_panel:
 				self.window.run_command( 'hide_panel', { 'panel': 'output.svn_panel' } )
 				self.commit_panel = None
@@ -275,20 +374,14 @@ class SvnPluginInfoCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 
 class SvnPluginFileInfoCommand( SvnPluginInfoCommand ):
 	def run( self ):
-		if not in_svn_root( self.get_file() ):
-			return
-
-		self.window.run_command( 'svn_plugin_info', { 'path': self.get_file() } )
+		self.run_in_svn_root( 'svn_plugin_info', self.get_file() )
 
 	def is_visible( self ):
 		return in_svn_root( self.get_file() )
 
 class SvnPluginFolderInfoCommand( SvnPluginInfoCommand ):
 	def run( self ):
-		if not in_svn_root( self.get_folder() ):
-			return
-
-		self.window.run_command( 'svn_plugin_info', { 'path': self.get_folder() } )
+		self.run_in_svn_root( 'svn_plugin_info', self.get_folder() )
 
 	def is_visible( self ):
 		return in_svn_root( self.get_folder() )
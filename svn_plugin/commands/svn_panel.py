@@ -0,0 +1,9 @@
+import sublime, sublime_plugin
+
+class SvnPluginReplaceContentCommand( sublime_plugin.TextCommand ):
+	def run( self, edit, characters = '' ):
+		read_only = self.view.is_read_only()
+
+		self.view.set_read_only( False )
+		self.view.replace( edit, sublime.Region( 0, self.view.size() ), characters )
+		self.view.set_read_only( read_only )
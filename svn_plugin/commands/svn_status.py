@@ -9,10 +9,9 @@ from ..threads.status_path 	import StatusPathThread
 class SvnPluginStatusCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 	def run( self, path = None ):
 		if path is None:
-			path = find_svn_root( self.get_file() )
+			file_path = self.get_file()
 
-			if path is None:
-				return
+			return self.run_async( 'Checking {0}' . format( file_path ), lambda: find_svn_root( file_path ), self.root_callback )
 
 		self.repository = Repository( path )
 
@@ -20,12 +19,16 @@ class SvnPluginStatusCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 		thread.start()
 		ThreadProgress( thread, 'Loading status', '' )
 
+	def root_callback( self, path ):
+		if path is not None:
+			self.run( path )
+
 	def status_callback( self, result ):
 		if not result:
-			return sublime.error_message( self.repository.error )
+			return sublime.error_message( result.error )
 
 		view 	= self.window.new_file()
-		output	= 'No files modified' if not self.repository.svn_output else self.repository.svn_output
+		output	= 'No files modified' if not result.output else result.output
 
 		view.set_name( 'SVNPlugin: Status' )
 		view.set_scratch( True )
@@ -37,20 +40,14 @@ class SvnPluginStatusCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 
 class SvnPluginFileStatusCommand( SvnPluginStatusCommand ):
 	def run( self ):
-		if not in_svn_root( self.get_file() ):
-			return
-
-		self.window.run_command( 'svn_plugin_status', { 'path': self.get_file() } )
+		self.run_in_svn_root( 'svn_plugin_status', self.get_file() )
 
 	def is_visible( self ):
 		return in_svn_root( self.get_file() )
 
 class SvnPluginFolderStatusCommand( SvnPluginStatusCommand ):
 	def run( self ):
-		if not in_svn_root( self.get_folder() ):
-			return
-
-		self.window.run_command( 'svn_plugin_status', { 'path': self.get_folder() } )
+		self.run_in_svn_root( 'svn_plugin_status', self.get_folder() )
 
 	def is_visible( self ):
 		return in_svn_root( self.get_folder() )
@@ -1,23 +1,25 @@
 import sublime, sublime_plugin
 
 from ..cache				import Cache
-from ..utils				import in_svn_root, find_svn_root, SvnPluginCommand
-from ..repository 			import Repository
+from ..utils				import in_svn_root, SvnPluginCommand
 from ..thread_progress 		import ThreadProgress
 from ..threads.update_path 	import UpdatePathThread
 
 class SvnPluginUpdateCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 	def run( self, path = None ):
-		if path is None:
-			path = find_svn_root( self.get_file() )
+		file_path = self.get_file()
 
-			if path is None:
-				return
+		self.run_async( 'Checking {0}' . format( path or file_path ), lambda: self.tracked_repository( path, file_path ), self.check_callback )
 
-		self.repository = Repository( path )
+	def check_callback( self, result ):
+		if result is None:
+			return
+
+		if not result:
+			return sublime.error_message( result.error )
 
-		if not self.repository.is_tracked():
-			return sublime.error_message( '{0} is not under version control' . format( path ) )
+		self.repository = result.payload
+		path			= self.repository.path
 
 		thread = UpdatePathThread( self.repository, self.update_callback )
 		thread.start()
@@ -25,13 +27,13 @@ class SvnPluginUpdateCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 
 	def update_callback( self, result ):
 		if not result:
-			return sublime.error_message( self.repository.svn_error )
+			return sublime.error_message( result.error )
 
 		view = self.window.new_file()
 
 		view.set_name( 'SVNPlugin: Update' )
 		view.set_scratch( True )
-		view.run_command( 'append', { 'characters': self.repository.svn_output } )
+		view.run_command( 'append', { 'characters': result.output } )
 		view.set_read_only( True )
 
 	def is_visible( self ):
@@ -39,20 +41,14 @@ class SvnPluginUpdateCommand( sublime_plugin.WindowCommand, SvnPluginCommand ):
 
 class SvnPluginFileUpdateCommand( SvnPluginUpdateCommand ):
 	def run( self ):
-		if not in_svn_root( self.get_file() ):
-			return
-
-		self.window.run_command( 'svn_plugin_update', { 'path': self.get_file() } )
+		self.run_in_svn_root( 'svn_plugin_update', self.get_file() )
 
 	def is_visible( self ):
 		return in_svn_root( self.get_file() )
 
 class SvnPluginFolderUpdateCommand( SvnPluginUpdateCommand ):
 	def run( self ):
-		if not in_svn_root( self.get_folder() ):
-			return
-
-		self.window.run_command( 'svn_plugin_update', { 'path': self.get_folder() } )
+		self.run_in_svn_root( 'svn_plugin_update', self.get_folder() )
 
 	def is_visible( self ):
 		return in_svn_root( self.get_folder() )
@@ -1,7 +1,11 @@
 from .on_activated	import SvnPluginOnActivated
 from .on_post_save	import SvnPluginOnPostSave
+from .on_query_context	import SvnPluginOnQueryContext
+from .on_selection_modified	import SvnPluginOnSelectionModified
 
 __all__ = [
 	'SvnPluginOnActivated',
-	'SvnPluginOnPostSave'
+	'SvnPluginOnPostSave',
+	'SvnPluginOnQueryContext',
+	'SvnPluginOnSelectionModified'
 ]
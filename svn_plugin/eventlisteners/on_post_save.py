@@ -4,18 +4,25 @@ import re
 
 from ..settings 	import Settings
 from ..repository 	import Repository
+from ..working_copy	import WorkingCopy
+from ..status_badge	import update_badge
+from ..thread_progress			import ThreadProgress
+from ..threads.command_task	import CommandTaskThread
 
 EDITOR_EOF_PREFIX 	= '--This line, and those below, will be ignored--\n'
 
 class SvnPluginOnPostSave( sublime_plugin.EventListener ):
+	def on_post_save_async( self, view ):
+		if view.file_name() is not None:
+			WorkingCopy.invalidate_path( view.file_name() )
+			update_badge( view )
+
 	def on_post_save( self, view ):
 		if not view.settings().has( 'SVNPlugin' ):
 			return
 
 		files_to_commit 	= view.settings().get( 'SVNPlugin' )
 		commit_file_path	= view.file_name()
-		settings			= Settings()
-		clipboard_format	= settings.svn_commit_clipboard()
 		repository			= Repository( files_to_commit )
 		message 			= view.substr( sublime.Region( 0, view.size() ) )
 		prefix_pos			= message.find( EDITOR_EOF_PREFIX )
@@ -26,17 +33,27 @@ class SvnPluginOnPostSave( sublime_plugin.EventListener ):
 		if len( message.strip() ) == 0 or message.strip() == 'Type commit message here...':
 			return sublime.message_dialog( 'Did not commit, log message unchanged or not specified' )
 
-		if not repository.commit( commit_file_path ):
-			return sublime.error_message( repository.svn_error )
+		# saving again while the commit runs must not start a second one
+		view.settings().erase( 'SVNPlugin' )
+
+		# the commit holds the working copy for writing, which never happens on the UI thread
+		thread = CommandTaskThread( 'Committing', lambda: repository.commit( commit_file_path ), lambda result: sublime.set_timeout( lambda: self.commit_callback( view, files_to_commit, commit_file_path, result ) ) )
+		thread.start()
+		ThreadProgress( thread, 'Committing' )
+
+	def commit_callback( self, view, files_to_commit, commit_file_path, result ):
+		clipboard_format = Settings().svn_commit_clipboard()
+
+		if not result:
+			view.settings().set( 'SVNPlugin', files_to_commit )
+			return sublime.error_message( result.error )
 
 		if clipboard_format is not None:
-			commit_revision = self.find_commit_revision( repository.svn_output )
+			commit_revision = self.find_commit_revision( result.output )
 
 			if commit_revision is not None:
 				sublime.set_clipboard( clipboard_format.replace( '$revision', commit_revision ) )
 
-		view.settings().erase( 'SVNPlugin' )
-
 		sublime.set_timeout( lambda: view.close(), 50 )
 		sublime.set_timeout( lambda: self.delete_commit_file( commit_file_path ), 1000 )
 		sublime.status_message( 'Commited file(s)' )
@@ -0,0 +1,17 @@
+import sublime, sublime_plugin
+
+from ..operation import Operation
+
+class SvnPluginOnQueryContext( sublime_plugin.EventListener ):
+	def on_query_context( self, view, key, operator, operand, match_all ):
+		if key != 'svn_plugin_operation_running':
+			return None
+
+		running = len( Operation.running() ) > 0
+
+		if operator == sublime.OP_EQUAL:
+			return running == operand
+		elif operator == sublime.OP_NOT_EQUAL:
+			return running != operand
+
+		return None
@@ -0,0 +1,16 @@
+import sublime, sublime_plugin
+
+from ..annotation import AnnotationView
+
+class SvnPluginOnSelectionModified( sublime_plugin.EventListener ):
+	def on_selection_modified( self, view ):
+		if view.id() not in AnnotationView.views:
+			return
+
+		summary = AnnotationView.summary( view )
+
+		if summary is not None:
+			sublime.status_message( summary )
+
+	def on_close( self, view ):
+		AnnotationView.views.pop( view.id(), None )
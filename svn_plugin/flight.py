@@ -0,0 +1,51 @@
+import threading
+
+from .operation import Operation
+
+WAIT_INTERVAL = 0.1
+
+class Flight():
+	flights	= dict()
+	lock	= threading.Lock()
+
+	@classmethod
+	def board( cls, key ):
+		with cls.lock:
+			flight = cls.flights.get( key )
+
+			# waiting on a flight the same thread is still running would never return
+			if flight is not None and flight.thread != threading.get_ident():
+				return flight, False
+
+			if flight is not None:
+				return None, False
+
+			flight 				= Flight( key )
+			cls.flights[ key ]	= flight
+
+			return flight, True
+
+	def __init__( self, key ):
+		self.key		= key
+		self.thread		= threading.get_ident()
+		self.landed		= threading.Event()
+		self.result		= None
+
+	def land( self, result = None ):
+		with Flight.lock:
+			if Flight.flights.get( self.key ) is self:
+				del Flight.flights[ self.key ]
+
+		self.result = result
+
+		self.landed.set()
+
+	def wait( self ):
+		operation = Operation.current()
+
+		# a passenger that is cancelled stops waiting, the flight carries on for everyone else
+		while not self.landed.wait( WAIT_INTERVAL ):
+			if operation is not None and operation.cancelled:
+				return None
+
+		return self.result
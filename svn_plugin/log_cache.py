@@ -0,0 +1,175 @@
+import sublime
+
+import os
+import json
+import hashlib
+import datetime
+import threading
+import time
+
+from .cache	import Cache
+from .records	import LogEntry
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+OPEN_CACHES	= 256
+
+def format_log( entries ):
+	separator 	= '-' * 72
+	output		= [ separator ]
+
+	for entry in entries:
+		try:
+			date = datetime.datetime.strptime( entry.date, DATE_FORMAT ).replace( tzinfo = datetime.timezone.utc ).astimezone( tz = None ).strftime( '%Y-%m-%d %H:%M:%S %z (%a, %d %b %Y)' )
+		except ValueError:
+			date = '(no date)'
+
+		line_count = entry.msg.count( '\n' ) + 1
+
+		output.append( 'r{0} | {1} | {2} | {3} line{4}' . format( entry.revision, entry.author or '(no author)', date, line_count, '' if line_count == 1 else 's' ) )
+
+		if entry.paths:
+			output.append( 'Changed paths:' )
+
+			for path in entry.paths:
+				if path.copyfrom_path:
+					output.append( '   {0} {1} (from {2}:{3})' . format( path.action, path.path, path.copyfrom_path, path.copyfrom_rev ) )
+				else:
+					output.append( '   {0} {1}' . format( path.action, path.path ) )
+
+		output.append( '' )
+		output.append( entry.msg )
+		output.append( separator )
+
+	return '\n' . join( output ) + '\n'
+
+class LogCache():
+	caches	= Cache.region( 'log_caches', max_entries = OPEN_CACHES )
+	lock	= threading.Lock()
+
+	@classmethod
+	def for_path( cls, uuid, repos_path, stop_on_copy ):
+		key = hashlib.sha1( '{0}\n{1}' . format( repos_path, 'stop-on-copy' if stop_on_copy else 'full' ).encode( 'utf-8' ) ).hexdigest()
+
+		# evicted caches are only forgotten in memory, the file is read again when they are next used
+		with cls.lock:
+			cache = cls.caches.get( ( uuid, key ) )
+
+			if cache is None:
+				cache = cls.caches.put( ( uuid, key ), LogCache( os.path.join( sublime.cache_path(), 'SVNPlugin', 'log', uuid, '{0}.log' . format( key ) ) ) )
+
+			return cache
+
+	@classmethod
+	def expire_all( cls ):
+		for key, cache in cls.caches.items():
+			cache.checked_at = None
+
+	def __init__( self, path ):
+		self.path 		= path
+		self.entries	= dict()
+		self.complete	= False
+		self.size		= None
+		self.checked_at	= None
+		self.lock		= threading.RLock()
+
+	def load( self ):
+		with self.lock:
+			try:
+				size = os.path.getsize( self.path )
+			except OSError:
+				size = 0
+
+			if size == self.size:
+				return
+
+			self.entries.clear()
+			self.complete = False
+
+			try:
+				with open( self.path, 'r', encoding = 'utf-8' ) as fh:
+					for line in fh:
+						try:
+							record = json.loads( line )
+
+							if 'complete' in record:
+								self.complete = record[ 'complete' ]
+							else:
+								entry = LogEntry.from_dict( record )
+								self.entries[ entry.revision ] = entry
+						except ( ValueError, KeyError, TypeError ):
+							continue # a partially written line from an interrupted append
+			except OSError:
+				pass
+
+			self.size = size
+
+	def append( self, entries, complete = False ):
+		with self.lock:
+			self.load()
+
+			lines = [ json.dumps( entry.as_dict(), separators = ( ',', ':' ) ) for entry in entries if entry.revision not in self.entries ]
+
+			if complete and not self.complete:
+				lines.append( json.dumps( { 'complete': True } ) )
+
+			if not lines:
+				return
+
+			try:
+				os.makedirs( os.path.dirname( self.path ), exist_ok = True )
+
+				with open( self.path, 'a', encoding = 'utf-8' ) as fh:
+					fh.write( '\n' . join( lines ) + '\n' )
+			except OSError:
+				self.size = None
+				return
+
+			for entry in entries:
+				self.entries[ entry.revision ] = entry
+
+			self.complete 	= self.complete or complete
+			self.size		= os.path.getsize( self.path )
+
+	def mark_checked( self ):
+		self.checked_at = time.time()
+
+	def checked_within( self, seconds ):
+		return self.checked_at is not None and time.time() - self.checked_at < seconds
+
+	def newest( self ):
+		with self.lock:
+			self.load()
+
+			return max( self.entries ) if self.entries else None
+
+	def oldest( self ):
+		with self.lock:
+			self.load()
+
+			return min( self.entries ) if self.entries else None
+
+	def count( self, before = None ):
+		with self.lock:
+			self.load()
+
+			if before is None:
+				return len( self.entries )
+
+			return len( [ revision for revision in self.entries if revision < before ] )
+
+	def is_complete( self ):
+		with self.lock:
+			self.load()
+
+			return self.complete
+
+	def latest( self, limit = None, before = None ):
+		with self.lock:
+			self.load()
+
+			revisions = sorted( [ revision for revision in self.entries if before is None or revision < before ], reverse = True )
+
+			if limit:
+				revisions = revisions[ : limit ]
+
+			return [ self.entries[ revision ] for revision in revisions ]
@@ -0,0 +1,57 @@
+import threading
+
+class Operation():
+	operations	= []
+	lock		= threading.Lock()
+	local		= threading.local()
+
+	@classmethod
+	def current( cls ):
+		return getattr( cls.local, 'operation', None )
+
+	@classmethod
+	def running( cls, background = False ):
+		# work the plugin started on its own is left out, escape shouldn't cancel what nobody is waiting for
+		with cls.lock:
+			return [ operation for operation in cls.operations if background or not operation.background ]
+
+	def __init__( self, name, background = False ):
+		self.name		= name
+		self.background	= background
+		self.processes	= set()
+		self.cancelled	= False
+		self.lock		= threading.Lock()
+
+	def __enter__( self ):
+		self.previous				= Operation.current()
+		Operation.local.operation	= self
+
+		with Operation.lock:
+			Operation.operations.append( self )
+
+		return self
+
+	def __exit__( self, exc_type, exc_value, traceback ):
+		Operation.local.operation = self.previous
+
+		with Operation.lock:
+			if self in Operation.operations:
+				Operation.operations.remove( self )
+
+	def attach( self, process ):
+		with self.lock:
+			self.processes.add( process )
+
+			if self.cancelled:
+				process.cancel()
+
+	def detach( self, process ):
+		with self.lock:
+			self.processes.discard( process )
+
+	def cancel( self ):
+		with self.lock:
+			self.cancelled = True
+
+			for process in self.processes:
+				process.cancel()
@@ -0,0 +1,59 @@
+import time
+import threading
+import collections
+
+from .settings		import Settings
+from .repository	import Repository
+from .scheduler		import Scheduler, PRIORITY_BACKGROUND
+from .cache			import Cache
+
+MAX_PER_MINUTE	= 6
+PATH_INTERVAL	= 300
+
+class Prefetcher():
+	recent		= Cache.region( 'prefetched', max_entries = 1024, ttl = PATH_INTERVAL, paths = True )
+	started		= collections.deque()
+	lock		= threading.Lock()
+
+	@classmethod
+	def prefetch( cls, file_path, root ):
+		settings = Settings()
+
+		if not settings.svn_prefetch():
+			return
+
+		# a file is only prefetched once in a while, and only a few files a minute are, however many are opened
+		with cls.lock:
+			now = time.time()
+
+			while cls.started and cls.started[ 0 ] <= now - 60:
+				cls.started.popleft()
+
+			if len( cls.started ) >= MAX_PER_MINUTE or cls.recent.contains( file_path ):
+				return
+
+			cls.started.append( now )
+			cls.recent.put( file_path, True )
+
+		Scheduler.submit( lambda: cls.fetch( file_path, settings ), priority = PRIORITY_BACKGROUND, key = root, name = 'Prefetch {0}' . format( file_path ) )
+
+	@classmethod
+	def fetch( cls, file_path, settings ):
+		repository		= Repository( file_path )
+		stop_on_copy	= settings.svn_stop_on_copy()
+
+		if not repository.is_tracked():
+			return
+
+		# without a log cache there is nowhere to keep the revisions
+		if repository.log_cache( stop_on_copy ) is None:
+			return
+
+		# the same first page the revisions panel asks for
+		log_limit = settings.svn_log_limit()
+		page_size = settings.svn_log_page_size()
+
+		if log_limit:
+			page_size = min( page_size, log_limit )
+
+		repository.log_entries( limit = page_size, stop_on_copy = stop_on_copy )
@@ -0,0 +1,135 @@
+import os
+import codecs
+import difflib
+
+from .wc_db import WorkingCopyDatabase, WorkingCopyDatabaseError, TRANSLATING_PROPERTIES, CHUNK_SIZE
+
+class PristineStore():
+	@classmethod
+	def for_path( cls, path ):
+		database = WorkingCopyDatabase.for_path( path )
+
+		if database is None:
+			return None
+
+		return PristineStore( database )
+
+	def __init__( self, database ):
+		self.database = database
+
+	def node( self, path ):
+		try:
+			node 	= self.database.node( path )
+			actual	= self.database.actual_node( path )
+		except WorkingCopyDatabaseError:
+			return None
+
+		# locally added or replaced nodes have no BASE text
+		if node is None or node[ 'kind' ] != 'file' or node[ 'op_depth' ] > 0:
+			return None
+
+		# keyword expansion and eol translation only happen inside svn
+		for value in ( node[ 'properties' ], actual[ 'properties' ] if actual else None ):
+			if value is not None and any( name in bytes( value ) for name in TRANSLATING_PROPERTIES ):
+				return None
+
+		return node
+
+	def pristine_path( self, path, revision = None ):
+		node = self.node( path )
+
+		if node is None or not self.covers( node, revision ):
+			return None
+
+		pristine_path = self.database.pristine_path( node[ 'checksum' ] )
+
+		if pristine_path is None or not os.path.isfile( pristine_path ):
+			return None
+
+		return pristine_path
+
+	def covers( self, node, revision ):
+		if revision is None or revision == 'BASE':
+			return True
+
+		try:
+			revision = int( str( revision ).lstrip( 'r' ) )
+		except ValueError:
+			return False
+
+		if node[ 'revision' ] is None or node[ 'changed_revision' ] is None:
+			return False
+
+		return node[ 'changed_revision' ] <= revision <= node[ 'revision' ]
+
+	def stream( self, pristine_path ):
+		with open( pristine_path, 'rb' ) as fh:
+			while True:
+				chunk = fh.read( CHUNK_SIZE )
+
+				if not chunk:
+					break
+
+				yield chunk
+
+	def cat( self, path, revision = None ):
+		pristine_path = self.pristine_path( path, revision )
+
+		if pristine_path is None:
+			return None
+
+		decoder = codecs.getincrementaldecoder( 'utf-8' )( errors = 'replace' )
+		content	= []
+
+		try:
+			for chunk in self.stream( pristine_path ):
+				content.append( decoder.decode( chunk ) )
+		except OSError:
+			return None
+
+		content.append( decoder.decode( b'', final = True ) )
+
+		return ''.join( content )
+
+	def diff( self, path ):
+		pristine_path = self.pristine_path( path )
+
+		if pristine_path is None:
+			return None
+
+		try:
+			with open( pristine_path, 'rb' ) as fh:
+				base = fh.read()
+
+			with open( path, 'rb' ) as fh:
+				working = fh.read()
+		except OSError:
+			return None
+
+		if base == working:
+			return ''
+
+		# leave binary files to svn so the output matches what it would report
+		if b'\0' in base or b'\0' in working:
+			return None
+
+		revision 	= self.node( path )[ 'revision' ]
+		lines		= difflib.unified_diff( self.split_lines( base ), self.split_lines( working ), '{0}\t(revision {1})' . format( path, revision ), '{0}\t(working copy)' . format( path ), lineterm = '\n' )
+		output		= [ 'Index: {0}\n' . format( path ), '{0}\n' . format( '=' * 67 ) ]
+
+		for line in lines:
+			if line.endswith( '\n' ):
+				output.append( line )
+			else:
+				output.append( '{0}\n\\ No newline at end of file\n' . format( line ) )
+
+		return ''.join( output )
+
+	def split_lines( self, content ):
+		lines 	= content.decode( 'utf-8', errors = 'replace' ).split( '\n' )
+		result	= [ '{0}\n' . format( line ) for line in lines[ : -1 ] ]
+
+		if lines[ -1 ]:
+			result.append( lines[ -1 ] )
+
+		return result
@@ -0,0 +1,148 @@
+import codecs
+import subprocess
+import threading
+import time
+
+CHUNK_SIZE		= 65536
+REAP_INTERVAL	= 5
+KILL_DELAY		= 5
+
+class Process():
+	children		= set()
+	children_lock	= threading.Lock()
+	reaper			= None
+
+	@classmethod
+	def spawn( cls, args, cwd = None ):
+		child = subprocess.Popen( args, stdin = subprocess.DEVNULL, stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL, cwd = cwd )
+
+		with cls.children_lock:
+			cls.children.add( child )
+
+		cls.reap()
+
+		return child
+
+	@classmethod
+	def reap( cls ):
+		with cls.children_lock:
+			# only the pending timer calls this with a reaper set, spawn leaves it to that timer
+			if cls.reaper is not None and threading.current_thread() is cls.reaper:
+				cls.reaper = None
+
+			for child in [ child for child in cls.children if child.poll() is not None ]:
+				cls.children.discard( child )
+
+			# keep polling for as long as there are children left, poll() is what collects them
+			if cls.children and cls.reaper is None:
+				cls.reaper 			= threading.Timer( REAP_INTERVAL, cls.reap )
+				cls.reaper.daemon	= True
+				cls.reaper.start()
+
+	def __init__( self, args, cwd = None, timeout = None ):
+		self.args		= args
+		self.timeout	= timeout
+		self.timed_out	= False
+		self.cancelled	= False
+		self.started	= time.time()
+		self.finished	= None
+		self.errors		= []
+		self.process	= subprocess.Popen( args, stdin = subprocess.DEVNULL, stdout = subprocess.PIPE, stderr = subprocess.PIPE, cwd = cwd )
+		self.reader		= threading.Thread( target = self.read_errors )
+		self.timer		= None
+
+		self.reader.daemon = True
+		self.reader.start()
+
+		if timeout:
+			self.timer 			= threading.Timer( timeout, self.expire )
+			self.timer.daemon	= True
+			self.timer.start()
+
+	def read_errors( self ):
+		for chunk in iter( lambda: self.process.stderr.read( CHUNK_SIZE ), b'' ):
+			self.errors.append( chunk )
+
+	def expire( self ):
+		if self.process.poll() is None:
+			self.timed_out = True
+			self.kill()
+
+	def kill( self ):
+		try:
+			self.process.kill()
+		except OSError:
+			pass
+
+	def cancel( self ):
+		if self.process.poll() is not None:
+			return
+
+		self.cancelled = True
+
+		# give svn a chance to release its working copy locks before it is killed
+		try:
+			self.process.terminate()
+		except OSError:
+			pass
+
+		timer 			= threading.Timer( KILL_DELAY, self.expire_cancelled )
+		timer.daemon	= True
+		timer.start()
+
+	def expire_cancelled( self ):
+		if self.process.poll() is None:
+			self.kill()
+
+	@property
+	def stdout( self ):
+		return self.process.stdout
+
+	def text( self ):
+		read	= getattr( self.process.stdout, 'read1', self.process.stdout.read )
+		decoder	= codecs.getincrementaldecoder( 'utf-8' )( errors = 'replace' )
+
+		for chunk in iter( lambda: read( CHUNK_SIZE ), b'' ):
+			text = decoder.decode( chunk )
+
+			if text:
+				yield text
+
+		text = decoder.decode( b'', final = True )
+
+		if text:
+			yield text
+
+	def read( self ):
+		return ''.join( self.text() )
+
+	def wait( self ):
+		self.process.stdout.close()
+		self.process.wait()
+		self.reader.join()
+
+		if self.timer is not None:
+			self.timer.cancel()
+
+		self.finished = time.time()
+
+		return self.process.returncode
+
+	@property
+	def returncode( self ):
+		return self.process.returncode
+
+	@property
+	def duration( self ):
+		return ( self.finished or time.time() ) - self.started
+
+	@property
+	def error( self ):
+		error = b''.join( self.errors ).decode( 'utf-8', errors = 'replace' )
+
+		if self.timed_out:
+			error = '{0}Timed out after {1} seconds' . format( error + '\n' if error else '', self.timeout )
+		elif self.cancelled:
+			error = '{0}Cancelled' . format( error + '\n' if error else '' )
+
+		return error
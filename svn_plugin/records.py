@@ -0,0 +1,130 @@
+import xml.etree.ElementTree as ET
+
+class StatusEntry():
+	__slots__ = ( 'path', 'item', 'props', 'revision', 'tree_conflicted' )
+
+	def __init__( self, path, item, props = None, revision = None, tree_conflicted = False ):
+		self.path 				= path
+		self.item				= item
+		self.props				= props
+		self.revision			= revision
+		self.tree_conflicted	= tree_conflicted
+
+class LogPath():
+	__slots__ = ( 'action', 'kind', 'path', 'copyfrom_path', 'copyfrom_rev' )
+
+	def __init__( self, action, kind, path, copyfrom_path = None, copyfrom_rev = None ):
+		self.action			= action
+		self.kind			= kind
+		self.path			= path
+		self.copyfrom_path	= copyfrom_path
+		self.copyfrom_rev	= copyfrom_rev
+
+class LogEntry():
+	__slots__ = ( 'revision', 'author', 'date', 'msg', 'paths' )
+
+	@classmethod
+	def from_dict( cls, value ):
+		return LogEntry( value[ 'revision' ], value[ 'author' ], value[ 'date' ], value[ 'msg' ], [ LogPath( *path ) for path in value[ 'paths' ] ] )
+
+	def __init__( self, revision, author, date, msg, paths ):
+		self.revision	= revision
+		self.author		= author
+		self.date		= date
+		self.msg		= msg
+		self.paths		= paths
+
+	def as_dict( self ):
+		return { 'revision': self.revision, 'author': self.author, 'date': self.date, 'msg': self.msg,
+				 'paths': [ [ path.action, path.kind, path.path, path.copyfrom_path, path.copyfrom_rev ] for path in self.paths ] }
+
+class InfoEntry():
+	__slots__ = ( 'path', 'kind', 'revision', 'url', 'root', 'uuid' )
+
+	def __init__( self, path, kind, revision, url, root, uuid ):
+		self.path		= path
+		self.kind		= kind
+		self.revision	= revision
+		self.url		= url
+		self.root		= root
+		self.uuid		= uuid
+
+class ListEntry():
+	__slots__ = ( 'name', 'kind', 'size', 'revision', 'author', 'date' )
+
+	def __init__( self, name, kind, size, revision, author, date ):
+		self.name		= name
+		self.kind		= kind
+		self.size		= size
+		self.revision	= revision
+		self.author		= author
+		self.date		= date
+
+class BlameEntry():
+	__slots__ = ( 'line', 'revision', 'author' )
+
+	def __init__( self, line, revision, author ):
+		self.line		= line
+		self.revision	= revision
+		self.author		= author
+
+def iter_elements( stream, tag ):
+	parents = []
+
+	for event, element in ET.iterparse( stream, events = ( 'start', 'end' ) ):
+		if event == 'start':
+			parents.append( element )
+			continue
+
+		parents.pop()
+
+		if element.tag == tag:
+			yield element
+
+			# detach finished elements so memory stays flat however long the output is
+			if parents:
+				parents[ -1 ].remove( element )
+
+def to_int( value, default = None ):
+	try:
+		return int( value )
+	except ( TypeError, ValueError ):
+		return default
+
+def iter_status( stream ):
+	for element in iter_elements( stream, 'entry' ):
+		wc_status = element.find( 'wc-status' )
+
+		if wc_status is None:
+			continue
+
+		yield StatusEntry( element.get( 'path' ), wc_status.get( 'item' ), wc_status.get( 'props' ), to_int( wc_status.get( 'revision' ) ), wc_status.get( 'tree-conflicted' ) == 'true' )
+
+def iter_log( stream ):
+	for element in iter_elements( stream, 'logentry' ):
+		paths = [ LogPath( path.get( 'action', '' ), path.get( 'kind', '' ), path.text or '', path.get( 'copyfrom-path' ), path.get( 'copyfrom-rev' ) ) for path in element.iter( 'path' ) ]
+
+		yield LogEntry( to_int( element.get( 'revision' ), 0 ), element.findtext( 'author', '' ), element.findtext( 'date', '' ), element.findtext( 'msg', '' ), paths )
+
+def iter_info( stream ):
+	for element in iter_elements( stream, 'entry' ):
+		yield InfoEntry( element.get( 'path' ), element.get( 'kind' ), to_int( element.get( 'revision' ) ), element.findtext( 'url' ), element.findtext( 'repository/root' ), element.findtext( 'repository/uuid' ) )
+
+def iter_list( stream ):
+	for element in iter_elements( stream, 'entry' ):
+		commit = element.find( 'commit' )
+
+		if commit is None:
+			yield ListEntry( element.findtext( 'name', '' ), element.get( 'kind' ), to_int( element.findtext( 'size' ) ), None, None, None )
+		else:
+			yield ListEntry( element.findtext( 'name', '' ), element.get( 'kind' ), to_int( element.findtext( 'size' ) ), to_int( commit.get( 'revision' ) ), commit.findtext( 'author' ), commit.findtext( 'date' ) )
+
+def iter_blame( stream ):
+	for element in iter_elements( stream, 'entry' ):
+		commit = element.find( 'commit' )
+
+		# lines without a commit are local modifications
+		if commit is None:
+			yield BlameEntry( to_int( element.get( 'line-number' ) ), -1, None )
+		else:
+			yield BlameEntry( to_int( element.get( 'line-number' ) ), to_int( commit.get( 'revision' ), -1 ), commit.findtext( 'author' ) )
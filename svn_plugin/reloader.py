@@ -14,30 +14,54 @@ module_load_order = [
 
 	'.cache',
 	'.settings',
+	'.records',
+	'.process',
+	'.operation',
+	'.result',
+	'.flight',
+	'.wc_db',
+	'.wc_lock',
 	'.svn',
+	'.scheduler',
+	'.watcher',
+	'.working_copy',
+	'.pristine',
+	'.log_cache',
+	'.revision_cache',
+	'.annotation',
 	'.repository',
-	'.utils',
 	'.thread_progress',
 
+	'.threads.svn_thread',
+	'.threads.command_task',
 	'.threads.annotate_file',
 	'.threads.diff_path',
 	'.threads.log_path',
 	'.threads.revision_file',
 	'.threads.revision_list_load',
+	'.threads.revision_prefetch',
 	'.threads.status_path',
 	'.threads.update_path',
 	'.threads',
+	'.utils',
+	'.prefetch',
+	'.status_badge',
+	'.snapshot',
 
 	'.eventlisteners.on_activated',
 	'.eventlisteners.on_post_save',
+	'.eventlisteners.on_query_context',
+	'.eventlisteners.on_selection_modified',
 	'.eventlisteners',
 
 	'.commands.svn_add',
 	'.commands.svn_annotate',
+	'.commands.svn_cancel',
 	'.commands.svn_commit',
 	'.commands.svn_diff',
 	'.commands.svn_info',
 	'.commands.svn_log',
+	'.commands.svn_panel',
 	'.commands.svn_status',
 	'.commands.svn_update',
 	'.commands'
@@ -1,55 +1,119 @@
 import os
-import xml.etree.ElementTree as ET
 import json
+import urllib.parse
 
 from .settings 	import Settings
 from .svn 		import SVN
+from .wc_db		import WorkingCopyDatabase, WorkingCopyDatabaseError
+from .working_copy	import WorkingCopy, MODIFIED_STATUSES
+from .pristine		import PristineStore
+from .log_cache		import LogCache
+from .revision_cache	import RevisionCache
+from .annotation		import Annotation, annotation_cache, split_lines
+from .result			import Result
+from .cache				import Cache
+
+LOG_FRESHNESS	= 60
+CHANGE_ENTRIES	= 64
+CHANGE_BYTES	= 4 * 1024 * 1024
+LOG_REVISIONS	= 100
+
+change_cache	= Cache.region( 'changes', max_entries = CHANGE_ENTRIES, max_size = CHANGE_BYTES, weigh = len )
 
 class Repository():
 	def __init__( self, path ):
 		self.settings 			= Settings()
 		self.svn				= SVN()
 		self.path 				= path
-		self.__error			= None
 
 	def is_modified( self ):
-		if not self.svn.status( self.path ):
-			return self.log_error( self.svn_error )
+		database = WorkingCopyDatabase.for_path( self.path )
 
-		try:
-			root = ET.fromstring( self.svn_output )
-		except ET.ParseError:
-			return self.log_error( 'Failed to parse XML' )
+		if database is not None:
+			try:
+				modified = database.is_modified( self.path )
+			except WorkingCopyDatabaseError as e:
+				modified = None
+				self.log_error( str( e ) )
+
+			if modified is not None:
+				return modified
+
+		working_copy = WorkingCopy.for_path( self.path )
+
+		if working_copy is not None:
+			modified = working_copy.is_modified( self.path, exact = True )
 
-		for child in root.getiterator( 'entry' ):
-			for wc_status in child.getiterator( 'wc-status' ):
-				value = wc_status.get( 'item' )
+			if modified is not None:
+				return modified
 
-				if value in ( 'added', 'deleted', 'replaced', 'modified', 'merged', 'conflicted' ):
-					return True
+			self.log_error( working_copy.error )
+
+		for entry in self.status_entries().payload or []:
+			if entry.item in MODIFIED_STATUSES:
+				return True
 
 		return False
 
-	def is_tracked( self ):
-		if not self.svn.info( self.path ):
-			if 'not a working copy' in self.svn_error:
-				return self.log_error( '{0} is not under version control'.format( self.path ) )
+	def changes( self ):
+		working_copy = WorkingCopy.for_path( self.path )
+
+		if working_copy is not None:
+			changes = working_copy.changes( self.path, exact = True )
+
+			if changes is not None:
+				return Result.local( payload = tuple( changes ) )
+
+			self.log_error( working_copy.error )
+
+		return self.status_entries()
 
-			return self.log_error( 'The following SVN error occurred: {0} ' . format( self.svn_error ) )
+	def status_entries( self ):
+		return self.checked( self.svn.status_entries( self.path ) )
+
+	def node( self ):
+		database = WorkingCopyDatabase.for_path( self.path )
+
+		if database is None:
+			return None
 
 		try:
-			root = ET.fromstring( self.svn_output )
-		except ET.ParseError:
-			return self.log_error( 'Failed to parse XML' )
+			return database.node( self.path )
+		except WorkingCopyDatabaseError as e:
+			self.log_error( str( e ) )
 
-		for child in root.getiterator( 'entry' ):
+		return None
+
+	def is_tracked( self ):
+		database = WorkingCopyDatabase.for_path( self.path )
+
+		if database is not None:
 			try:
-				if self.path == child.attrib[ 'path' ]:
-					return True
-			except KeyError:
-				return self.log_error( 'Failed to find path attribute' )
+				node = database.node( self.path )
+			except WorkingCopyDatabaseError as e:
+				self.log_error( str( e ) )
+			else:
+				if node is None or not node[ 'tracked' ]:
+					return self.log_error( '{0} is not under version control'.format( self.path ) )
 
-		return False
+				return Result.local()
+
+		result = self.info_entries()
+
+		if not result:
+			if 'not a working copy' in result.error:
+				return self.log_error( '{0} is not under version control'.format( self.path ) )
+
+			return self.log_error( 'The following SVN error occurred: {0} ' . format( result.error ) )
+
+		for entry in result.payload:
+			if self.path == entry.path:
+				return result
+
+		return Result.failure( '{0} is not under version control'.format( self.path ) )
+
+	def info_entries( self ):
+		return self.svn.info_entries( self.path )
 
 	def revert( self ):
 		return self.svn.revert( self.path )
@@ -58,12 +122,115 @@ class Repository():
 		if not os.path.isfile( commit_file_path ):
 			return self.log_error( 'Failed to find commit file {0}' . format( commit_file_path ) )
 
-		return self.svn.commit( self.path, commit_file_path )
+		return self.expire_logs( self.svn.commit( self.path, commit_file_path ) )
 
 	def annotate( self, revision = None ):
 		return self.svn.annotate( self.path, revision )
 
+	def annotation( self, revision = None ):
+		location 	= self.location()
+		key			= None
+
+		if location is not None:
+			if revision is not None and str( revision ).isdigit():
+				key = '{0}:{1}@{2}' . format( location[ 0 ], location[ 1 ], revision )
+			elif revision is None:
+				# the working file is annotated as well, so its state is part of the key
+				try:
+					stat = os.stat( self.path )
+				except OSError:
+					stat = None
+
+				node = self.node()
+
+				if stat is not None and node is not None:
+					key = '{0}:{1}@WORKING:{2}:{3}:{4}' . format( location[ 0 ], location[ 1 ], node[ 'revision' ], stat.st_size, stat.st_mtime_ns )
+
+		if key is not None:
+			annotation = annotation_cache.get( key )
+
+			if annotation is not None:
+				return Result.local( payload = annotation )
+
+		blame = self.checked( self.svn.annotate_entries( self.path, revision ) )
+
+		if not blame:
+			return blame
+
+		if revision is None:
+			try:
+				with open( self.path, 'rb' ) as fh:
+					content = fh.read().decode( 'utf-8', errors = 'replace' )
+			except OSError as e:
+				return self.log_error( str( e ) )
+		else:
+			result = self.cat( revision )
+
+			if not result:
+				return self.log_error( result.error )
+
+			content = result.output
+
+		annotation = Annotation( split_lines( content ) )
+
+		for entry in blame.payload:
+			annotation.add( entry.revision, entry.author )
+
+		annotation.metadata = self.revision_metadata( annotation.distinct_revisions() )
+
+		if key is not None:
+			annotation_cache.put( key, annotation )
+
+		return Result.local( payload = annotation )
+
+	def revision_metadata( self, revisions ):
+		metadata = dict()
+
+		for stop_on_copy in ( True, False ):
+			cache = self.log_cache( stop_on_copy )
+
+			if cache is not None:
+				for entry in cache.latest():
+					if entry.revision in revisions:
+						metadata[ entry.revision ] = entry
+
+		missing = [ str( revision ) for revision in revisions if revision not in metadata ]
+
+		# one log call for every batch of revisions the log caches don't know about, batches keep the command line short
+		for start in range( 0, len( missing ), LOG_REVISIONS ):
+			for entry in self.checked( self.svn.log_entries( self.path, stop_on_copy = False, revision = missing[ start : start + LOG_REVISIONS ] ) ).payload or []:
+				metadata[ entry.revision ] = entry
+
+		return metadata
+
 	def diff( self, revision_number = None, change_number = None, diff_tool = None ):
+		if revision_number is None and change_number is None and diff_tool is None:
+			pristine_store = PristineStore.for_path( self.path )
+
+			if pristine_store is not None:
+				output = pristine_store.diff( self.path )
+
+				if output is not None:
+					return Result.local( output )
+
+		# what a numbered commit changed never changes, so it is kept by repository location
+		if revision_number is None and diff_tool is None and change_number is not None and str( change_number ).isdigit():
+			location = self.location()
+
+			if location is not None:
+				key		= '{0}:{1}@{2}' . format( location[ 0 ], location[ 1 ], change_number )
+				output	= change_cache.get( key )
+
+				if output is not None:
+					return Result.local( output )
+
+				result = self.svn.diff( self.path, change = change_number )
+
+				if result:
+					change_cache.put( key, result.output )
+
+				return result
+
 		return self.svn.diff( self.path, revision = revision_number, change = change_number, diff_tool = diff_tool )
 
 	def add( self ):
@@ -72,38 +239,141 @@ class Repository():
 	def log( self, xml = True, stop_on_copy = True, limit = None, revision = None ):
 		return self.svn.log( self.path, xml = xml, stop_on_copy = stop_on_copy, limit = limit, revision = revision )
 
+	def log_entries( self, limit = None, stop_on_copy = True, before = None ):
+		cache = self.log_cache( stop_on_copy )
+
+		if cache is None:
+			return self.fetch_log( limit = limit, stop_on_copy = stop_on_copy, revision = None if before is None else '{0}:1' . format( before - 1 ) )
+
+		newest = cache.newest()
+
+		# only the first page checks the server for new revisions, and not again right after it was prefetched
+		# unless the working copy already has a newer change of the path than the cache
+		if newest is not None and before is None and not ( cache.checked_within( LOG_FRESHNESS ) and self.changed_before( newest ) ):
+			entries = self.fetch_log( stop_on_copy = stop_on_copy, revision = 'HEAD:{0}' . format( newest + 1 ) )
+
+			# keep serving the cached history when the server can't be reached
+			if entries:
+				cache.append( entries.payload )
+				cache.mark_checked()
+
+		# the cache always holds one unbroken run of revisions, so older pages are fetched from its oldest entry down
+		while not cache.is_complete() and ( not limit or cache.count( before ) < limit ):
+			oldest	= cache.oldest()
+			wanted	= limit - cache.count( before ) if limit else None
+
+			if oldest is not None and oldest <= 1:
+				cache.append( [], complete = True )
+				break
+
+			entries = self.fetch_log( limit = wanted, stop_on_copy = stop_on_copy, revision = None if oldest is None else '{0}:1' . format( oldest - 1 ) )
+
+			if not entries:
+				if not cache.count( before ):
+					return entries
+
+				break
+
+			cache.append( entries.payload, complete = not wanted or len( entries.payload ) < wanted )
+
+			if oldest is None:
+				cache.mark_checked()
+
+		return Result.local( payload = tuple( cache.latest( limit, before ) ) )
+
+	def fetch_log( self, limit = None, stop_on_copy = True, revision = None ):
+		result = self.svn.log_entries( self.path, stop_on_copy = stop_on_copy, limit = limit, revision = revision )
+
+		# asking for revisions newer than HEAD just means there is nothing new
+		if not result and revision is not None and 'E160006' in result.error:
+			return Result( result.args, 0, payload = (), started = result.started, duration = result.duration )
+
+		return self.checked( result )
+
+	def changed_before( self, revision ):
+		node = self.node()
+
+		return node is not None and node[ 'changed_revision' ] is not None and node[ 'changed_revision' ] <= revision
+
+	def log_cache( self, stop_on_copy ):
+		location = self.location()
+
+		if location is None:
+			return None
+
+		return LogCache.for_path( location[ 0 ], location[ 1 ], stop_on_copy )
+
+	def location( self ):
+		node = self.node()
+
+		if node is not None and node[ 'uuid' ] is not None:
+			return ( node[ 'uuid' ], node[ 'repos_path' ] )
+
+		if node is not None:
+			return None
+
+		for entry in self.info_entries().payload or []:
+			if entry.uuid and entry.url and entry.root and entry.url.startswith( entry.root ):
+				return ( entry.uuid, urllib.parse.unquote( entry.url[ len( entry.root ) : ] ).strip( '/' ) )
+
+		return None
+
 	def status( self, xml = True, quiet = False ):
 		return self.svn.status( self.path, xml = xml, quiet = quiet )
 
 	def update( self ):
-		return self.svn.update( self.path )
+		return self.expire_logs( self.svn.update( self.path ) )
+
+	def expire_logs( self, result ):
+		# new revisions may be the ones the user asks for next, so every history is checked against the server again
+		if result:
+			LogCache.expire_all()
+
+		return result
 
 	def cat( self, revision = None ):
-		return self.svn.cat( self.path, revision = revision )
+		pristine_store = PristineStore.for_path( self.path )
 
-	def ls( self ):
-		return self.svn.ls( self.path )
+		if pristine_store is not None:
+			content = pristine_store.cat( self.path, revision )
 
-	def log_error( self, error ):
-		self.__error = error
+			if content is not None:
+				return Result.local( content )
 
-		if self.settings.log_errors():
-			print( error )
+		# numbered revisions never change, anything else has to go to the server
+		if revision is None or not str( revision ).isdigit():
+			return self.svn.cat( self.path, revision = revision )
 
-		return False
+		location	= self.location()
+		cache		= RevisionCache.get_instance( self.settings.svn_revision_cache_size() * 1024 * 1024, self.settings.svn_revision_cache_compress() )
+
+		if location is not None:
+			content = cache.get( location[ 0 ], location[ 1 ], revision )
+
+			if content is not None:
+				return Result.local( content )
+
+		result = self.svn.cat( self.path, revision = revision )
 
-	@property
-	def error( self ):
-		return self.__error
+		if result and location is not None:
+			cache.put( location[ 0 ], location[ 1 ], revision, result.output )
 
-	@property
-	def svn_returncode( self ):
-		return self.svn.results[ 'returncode' ]
+		return result
+
+	def ls( self ):
+		return self.svn.ls( self.path )
 
-	@property
-	def svn_output( self ):
-		return self.svn.results[ 'stdout' ]
+	def list_entries( self ):
+		return self.checked( self.svn.list_entries( self.path ) )
+
+	def checked( self, result ):
+		if not result:
+			self.log_error( result.error )
+
+		return result
+
+	def log_error( self, error ):
+		if self.settings.log_errors():
+			print( error )
 
-	@property
-	def svn_error( self ):
-		return self.svn.results[ 'stderr' ]
+		return Result.failure( error )
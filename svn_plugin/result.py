@@ -0,0 +1,33 @@
+import time
+
+class Result():
+	__slots__ = ( 'args', 'returncode', 'output', 'error', 'payload', 'started', 'duration' )
+
+	@classmethod
+	def local( cls, output = '', payload = None ):
+		return Result( None, 0, output, '', payload )
+
+	@classmethod
+	def failure( cls, error, args = None ):
+		return Result( args, 1, '', error )
+
+	def __init__( self, args, returncode, output = '', error = '', payload = None, started = None, duration = 0 ):
+		object.__setattr__( self, 'args', tuple( args ) if args is not None else None )
+		object.__setattr__( self, 'returncode', returncode )
+		object.__setattr__( self, 'output', output )
+		object.__setattr__( self, 'error', error )
+		object.__setattr__( self, 'payload', payload )
+		object.__setattr__( self, 'started', started if started is not None else time.time() )
+		object.__setattr__( self, 'duration', duration )
+
+	def __setattr__( self, name, value ):
+		raise AttributeError( 'Result objects are immutable' )
+
+	def __delattr__( self, name ):
+		raise AttributeError( 'Result objects are immutable' )
+
+	def __bool__( self ):
+		return self.returncode == 0
+
+	def __repr__( self ):
+		return '<Result {0} returncode={1} duration={2:.3f}s>' . format( self.args[ 0 ] if self.args else 'local', self.returncode, self.duration )
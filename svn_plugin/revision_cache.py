@@ -0,0 +1,141 @@
+import sublime
+
+import os
+import zlib
+import hashlib
+import threading
+
+from .cache import Cache
+
+MEMORY_ENTRIES	= 16
+MEMORY_BYTES	= 8 * 1024 * 1024
+
+class RevisionCache():
+	instance	= None
+	lock		= threading.Lock()
+
+	@classmethod
+	def get_instance( cls, max_bytes, compress ):
+		with cls.lock:
+			if cls.instance is None:
+				cls.instance = RevisionCache( os.path.join( sublime.cache_path(), 'SVNPlugin', 'revisions' ), max_bytes, compress )
+			else:
+				cls.instance.max_bytes	= max_bytes
+				cls.instance.compress	= compress
+
+			return cls.instance
+
+	def __init__( self, path, max_bytes, compress ):
+		self.path		= path
+		self.max_bytes	= max_bytes
+		self.compress	= compress
+		self.files		= None
+		self.memory		= Cache.region( 'revisions', max_entries = MEMORY_ENTRIES, max_size = MEMORY_BYTES, weigh = len )
+		self.lock		= threading.RLock()
+
+	def key( self, uuid, repos_path, revision ):
+		return hashlib.sha1( '{0}\n{1}\n{2}' . format( uuid, repos_path, revision ).encode( 'utf-8' ) ).hexdigest()
+
+	def file_path( self, key, compressed ):
+		return os.path.join( self.path, key[ : 2 ], '{0}{1}' . format( key, '.z' if compressed else '.txt' ) )
+
+	def load( self ):
+		if self.files is not None:
+			return
+
+		# file mtimes double as the last access times for the LRU order
+		self.files = dict()
+
+		for folder, folders, files in os.walk( self.path ):
+			for name in files:
+				file_path = os.path.join( folder, name )
+
+				try:
+					stat = os.stat( file_path )
+				except OSError:
+					continue
+
+				self.files[ file_path ] = ( stat.st_mtime, stat.st_size )
+
+	def get( self, uuid, repos_path, revision ):
+		key = self.key( uuid, repos_path, revision )
+
+		with self.lock:
+			content = self.memory.get( key )
+
+			if content is not None:
+				return content
+
+			self.load()
+
+			for compressed in ( True, False ):
+				file_path = self.file_path( key, compressed )
+
+				if file_path not in self.files:
+					continue
+
+				try:
+					with open( file_path, 'rb' ) as fh:
+						data = fh.read()
+
+					content = ( zlib.decompress( data ) if compressed else data ).decode( 'utf-8' )
+
+					os.utime( file_path, None )
+				except ( OSError, zlib.error, UnicodeDecodeError ):
+					self.remove( file_path )
+					continue
+
+				self.files[ file_path ] = ( os.path.getmtime( file_path ), self.files[ file_path ][ 1 ] )
+				self.memory.put( key, content )
+
+				return content
+
+		return None
+
+	def put( self, uuid, repos_path, revision, content ):
+		key = self.key( uuid, repos_path, revision )
+
+		with self.lock:
+			self.memory.put( key, content )
+			self.load()
+
+			data 		= content.encode( 'utf-8' )
+			data		= zlib.compress( data ) if self.compress else data
+			file_path	= self.file_path( key, self.compress )
+
+			if len( data ) > self.max_bytes:
+				return
+
+			try:
+				os.makedirs( os.path.dirname( file_path ), exist_ok = True )
+
+				with open( file_path + '.tmp', 'wb' ) as fh:
+					fh.write( data )
+
+				os.replace( file_path + '.tmp', file_path )
+			except OSError:
+				return
+
+			self.files[ file_path ] = ( os.path.getmtime( file_path ), len( data ) )
+			self.evict()
+
+	def evict( self ):
+		total = sum( size for mtime, size in self.files.values() )
+
+		if total <= self.max_bytes:
+			return
+
+		for file_path in sorted( self.files, key = lambda file_path: self.files[ file_path ][ 0 ] ):
+			total -= self.files[ file_path ][ 1 ]
+			self.remove( file_path )
+
+			if total <= self.max_bytes:
+				break
+
+	def remove( self, file_path ):
+		self.files.pop( file_path, None )
+
+		try:
+			os.remove( file_path )
+		except OSError:
+			pass
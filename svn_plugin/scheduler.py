@@ -0,0 +1,145 @@
+import itertools
+import threading
+import traceback
+
+PRIORITY_USER		= 0
+PRIORITY_BACKGROUND	= 1
+IDLE_TIMEOUT		= 30
+
+class Task():
+	def __init__( self, target, priority = PRIORITY_USER, key = None, name = None ):
+		self.target		= target
+		self.priority	= priority
+		self.key		= key
+		self.name		= name
+		self.done		= threading.Event()
+		self.error		= None
+
+	def run( self ):
+		try:
+			self.target()
+		except Exception as e:
+			self.error = e
+
+			print( 'SVNPlugin: {0} failed' . format( self.name or 'task' ) )
+			traceback.print_exc()
+		finally:
+			self.done.set()
+
+	def is_done( self ):
+		return self.done.is_set()
+
+	def wait( self, timeout = None ):
+		return self.done.wait( timeout )
+
+class Scheduler():
+	instance	= None
+	lock		= threading.Lock()
+
+	@classmethod
+	def get_instance( cls ):
+		with cls.lock:
+			if cls.instance is None:
+				cls.instance = Scheduler()
+
+			return cls.instance
+
+	@classmethod
+	def configure( cls, max_workers, working_copy_workers ):
+		scheduler = cls.get_instance()
+
+		with scheduler.condition:
+			scheduler.max_workers 			= max( 1, max_workers )
+			scheduler.working_copy_workers	= max( 1, working_copy_workers )
+			scheduler.condition.notify_all()
+
+	@classmethod
+	def submit( cls, target, priority = PRIORITY_USER, key = None, name = None ):
+		return cls.get_instance().enqueue( Task( target, priority, key, name ) )
+
+	def __init__( self, max_workers = 4, working_copy_workers = 2 ):
+		self.max_workers 			= max_workers
+		self.working_copy_workers	= working_copy_workers
+		self.condition				= threading.Condition()
+		self.queue					= []
+		self.sequence				= itertools.count()
+		self.workers				= 0
+		self.idle					= 0
+		self.running				= dict()
+		self.running_background		= 0
+
+	def enqueue( self, task ):
+		with self.condition:
+			self.queue.append( ( task.priority, next( self.sequence ), task ) )
+
+			if len( self.queue ) > self.idle and self.workers < self.max_workers:
+				self.workers += 1
+
+				worker 			= threading.Thread( target = self.work, name = 'SVNPlugin worker' )
+				worker.daemon	= True
+				worker.start()
+
+			self.condition.notify_all()
+
+		return task
+
+	def next_task( self ):
+		for index, ( priority, sequence, task ) in enumerate( sorted( self.queue ) ):
+			running = self.running.get( task.key, 0 ) if task.key is not None else 0
+
+			if running >= self.working_copy_workers:
+				continue
+
+			# background work leaves one of the working copy's workers to commands, so refreshes never hold one up
+			if priority != PRIORITY_USER and running >= self.working_copy_workers - 1 and self.working_copy_workers > 1:
+				continue
+
+			# one worker is always left for user initiated work
+			if priority != PRIORITY_USER and self.running_background >= self.max_workers - 1 and self.max_workers > 1:
+				continue
+
+			self.queue.remove( ( priority, sequence, task ) )
+
+			return task
+
+		return None
+
+	def work( self ):
+		while True:
+			with self.condition:
+				task = self.next_task()
+
+				while task is None:
+					if self.workers > self.max_workers:
+						self.workers -= 1
+						return
+
+					self.idle += 1
+					signalled = self.condition.wait( IDLE_TIMEOUT )
+					self.idle -= 1
+
+					task = self.next_task()
+
+					# workers that have been idle for a while go away and are started again on demand
+					if task is None and not signalled and not self.queue:
+						self.workers -= 1
+						return
+
+				self.started( task, 1 )
+
+			try:
+				task.run()
+			finally:
+				with self.condition:
+					self.started( task, -1 )
+					self.condition.notify_all()
+
+	def started( self, task, count ):
+		if task.key is not None:
+			self.running[ task.key ] = self.running.get( task.key, 0 ) + count
+
+			if not self.running[ task.key ]:
+				del self.running[ task.key ]
+
+		if task.priority != PRIORITY_USER:
+			self.running_background += count
@@ -52,6 +52,16 @@ class Settings():
 
 		return value
 
+	def svn_log_page_size( self ):
+		self.load_settings()
+
+		value = self.settings.get( 'svn_log_page_size' )
+
+		if type( value ) is not int or value <= 0:
+			return 25
+
+		return value
+
 	def svn_stop_on_copy( self ):
 		self.load_settings()
 
@@ -91,3 +101,93 @@ class Settings():
 			return None
 
 		return value
+
+	def svn_watch_working_copies( self ):
+		self.load_settings()
+
+		value = self.settings.get( 'svn_watch_working_copies' )
+
+		if type( value ) is not bool:
+			return True
+
+		return value
+
+	def svn_watch_poll_interval( self ):
+		self.load_settings()
+
+		value = self.settings.get( 'svn_watch_poll_interval' )
+
+		if type( value ) not in ( int, float ) or value <= 0:
+			return 5
+
+		return value
+
+	def svn_status_badge( self ):
+		self.load_settings()
+
+		value = self.settings.get( 'svn_status_badge' )
+
+		if type( value ) is not bool:
+			return True
+
+		return value
+
+	def svn_prefetch( self ):
+		self.load_settings()
+
+		value = self.settings.get( 'svn_prefetch' )
+
+		if type( value ) is not bool:
+			return True
+
+		return value
+
+	def svn_warm_start( self ):
+		self.load_settings()
+
+		value = self.settings.get( 'svn_warm_start' )
+
+		if type( value ) is not bool:
+			return True
+
+		return value
+
+	def svn_max_workers( self ):
+		self.load_settings()
+
+		value = self.settings.get( 'svn_max_workers' )
+
+		if type( value ) is not int or value <= 0:
+			return 4
+
+		return value
+
+	def svn_working_copy_workers( self ):
+		self.load_settings()
+
+		value = self.settings.get( 'svn_working_copy_workers' )
+
+		if type( value ) is not int or value <= 0:
+			return 2
+
+		return value
+
+	def svn_revision_cache_size( self ):
+		self.load_settings()
+
+		value = self.settings.get( 'svn_revision_cache_size' )
+
+		if type( value ) is not int or value < 0:
+			return 64
+
+		return value
+
+	def svn_revision_cache_compress( self ):
+		self.load_settings()
+
+		value = self.settings.get( 'svn_revision_cache_compress' )
+
+		if type( value ) is not bool:
+			return True
+
+		return value
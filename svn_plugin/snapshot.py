@@ -0,0 +1,109 @@
+import sublime
+
+import os
+import json
+import zlib
+import hashlib
+import threading
+
+from .settings		import Settings
+from .working_copy	import WorkingCopy
+from .scheduler		import Scheduler, PRIORITY_BACKGROUND
+from .utils			import svn_roots, remember_svn_root
+from .cache			import MISSING
+
+SNAPSHOT_VERSION	= 2
+SAVE_INTERVAL		= 300
+
+class Snapshot():
+	timer	= None
+	digest	= None
+	lock	= threading.Lock()
+
+	@classmethod
+	def path( cls ):
+		return os.path.join( sublime.cache_path(), 'SVNPlugin', 'snapshot.json.z' )
+
+	@classmethod
+	def start( cls ):
+		if not Settings().svn_warm_start():
+			return
+
+		Scheduler.submit( cls.load, priority = PRIORITY_BACKGROUND, name = 'Load working copy snapshot' )
+
+		cls.schedule()
+
+	@classmethod
+	def stop( cls ):
+		with cls.lock:
+			if cls.timer is None:
+				return
+
+			cls.timer.cancel()
+			cls.timer = None
+
+		cls.save()
+
+	@classmethod
+	def schedule( cls ):
+		with cls.lock:
+			cls.timer 			= threading.Timer( SAVE_INTERVAL, cls.periodic_save )
+			cls.timer.daemon	= True
+			cls.timer.start()
+
+	@classmethod
+	def periodic_save( cls ):
+		Scheduler.submit( cls.save, priority = PRIORITY_BACKGROUND, name = 'Save working copy snapshot' )
+
+		with cls.lock:
+			if cls.timer is None:
+				return
+
+		cls.schedule()
+
+	@classmethod
+	def load( cls ):
+		try:
+			with open( cls.path(), 'rb' ) as fh:
+				data = json.loads( zlib.decompress( fh.read() ).decode( 'utf-8' ) )
+		except ( OSError, ValueError, zlib.error ):
+			return
+
+		if not isinstance( data, dict ) or data.get( 'version' ) != SNAPSHOT_VERSION:
+			return
+
+		# working copies that were removed while the editor was closed are left out, the rest is checked on first use
+		roots = set( [ root for root in data[ 'working_copies' ] if os.path.isdir( os.path.join( root, '.svn' ) ) ] )
+
+		with WorkingCopy.lock:
+			for root in roots:
+				if root not in WorkingCopy.working_copies:
+					WorkingCopy.snapshots[ root ] = data[ 'working_copies' ][ root ]
+
+		for path, root in data[ 'roots' ]:
+			if root in roots and svn_roots.get( path, MISSING ) is MISSING and os.path.exists( path ):
+				remember_svn_root( path, root )
+
+	@classmethod
+	def save( cls ):
+		data 	= { 'version': SNAPSHOT_VERSION, 'working_copies': WorkingCopy.all_snapshots(),
+					'roots': [ [ path, root ] for path, root in svn_roots.items() if root is not None ] }
+		content	= zlib.compress( json.dumps( data, separators = ( ',', ':' ) ).encode( 'utf-8' ) )
+		digest	= hashlib.sha1( content ).hexdigest()
+
+		if digest == cls.digest:
+			return
+
+		path = cls.path()
+
+		try:
+			os.makedirs( os.path.dirname( path ), exist_ok = True )
+
+			with open( path + '.tmp', 'wb' ) as fh:
+				fh.write( content )
+
+			os.replace( path + '.tmp', path )
+		except OSError:
+			return
+
+		cls.digest = digest
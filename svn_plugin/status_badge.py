@@ -0,0 +1,120 @@
+import sublime
+
+import os
+import threading
+
+from .settings		import Settings
+from .wc_db		import WorkingCopyDatabase, WorkingCopyDatabaseError
+from .working_copy	import WorkingCopy
+from .scheduler		import Scheduler, PRIORITY_BACKGROUND
+from .prefetch		import Prefetcher
+from .utils			import find_svn_root, warm_svn_root
+
+STATUS_KEY		= 'svn_plugin_status'
+SETTLE_DELAY	= 250
+
+latest	= [ 0 ]
+lock	= threading.Lock()
+
+def update_badge( view ):
+	file_path = view.file_name()
+
+	if file_path is None:
+		return
+
+	settings = Settings()
+
+	if not settings.svn_status_badge():
+		view.erase_status( STATUS_KEY )
+
+		if not settings.svn_prefetch():
+			warm_svn_root( file_path )
+			return
+
+	# only the last of a quick run of tab switches is looked up
+	with lock:
+		latest[ 0 ] += 1
+		token = latest[ 0 ]
+
+	sublime.set_timeout( lambda: settle( view, file_path, token ), SETTLE_DELAY )
+
+def settle( view, file_path, token ):
+	with lock:
+		if latest[ 0 ] != token:
+			return
+
+	if not view.is_valid() or view.file_name() != file_path:
+		return
+
+	Scheduler.submit( lambda: publish( view, file_path ), priority = PRIORITY_BACKGROUND, name = 'Status of {0}' . format( file_path ) )
+
+def publish( view, file_path ):
+	root = find_svn_root( file_path )
+
+	if root is not None:
+		Prefetcher.prefetch( file_path, root )
+
+	if not Settings().svn_status_badge():
+		return
+
+	badge = find_badge( file_path, root )
+
+	def show():
+		if not view.is_valid() or view.file_name() != file_path:
+			return
+
+		if badge is None:
+			view.erase_status( STATUS_KEY )
+		else:
+			view.set_status( STATUS_KEY, badge )
+
+	sublime.set_timeout( show, 0 )
+
+def find_badge( file_path, root ):
+	if root is None:
+		return None
+
+	working_copy = WorkingCopy.for_path( file_path )
+
+	if working_copy is None:
+		return None
+
+	changes = working_copy.changes( file_path )
+
+	if changes is None:
+		return None
+
+	path	= os.path.abspath( file_path )
+	entry	= next( ( entry for entry in changes if entry.path == path ), None )
+	node	= None
+	known	= False
+
+	# without a readable wc.db nothing says the file isn't versioned, with one a missing node does
+	database = WorkingCopyDatabase.for_path( file_path )
+
+	if database is not None:
+		try:
+			node	= database.node( path )
+			known	= True
+		except WorkingCopyDatabaseError:
+			pass
+
+	if entry is not None and ( entry.item == 'conflicted' or entry.tree_conflicted ):
+		state = 'conflicted'
+	elif entry is not None and entry.item in ( 'unversioned', 'ignored' ):
+		return 'SVN: unversioned'
+	elif entry is not None and entry.item != 'normal':
+		state = entry.item
+	elif entry is not None and entry.props in ( 'modified', 'conflicted' ):
+		state = 'modified' if entry.props == 'modified' else 'conflicted'
+	elif known and ( node is None or not node[ 'tracked' ] ):
+		return 'SVN: unversioned'
+	else:
+		state = 'versioned'
+
+	revision = node[ 'revision' ] if node is not None else entry.revision if entry is not None else None
+
+	if revision is None:
+		return 'SVN: {0}' . format( state )
+
+	return 'SVN: r{0} {1}' . format( revision, state )
@@ -1,13 +1,28 @@
 import os
-import subprocess
+import time
 import shlex
+import threading
+import xml.etree.ElementTree as ET
+
+from . 			import records
+from .process	import Process
+from .operation	import Operation
+from .flight	import Flight
+from .result	import Result
+from .wc_db		import WorkingCopyDatabase
+from .wc_lock	import WorkingCopyLock, WorkingCopyLockError
+
+READ_ONLY_COMMANDS 	= ( 'info', 'log', 'annotate', 'diff', 'cat', 'status', 'ls' )
+LOCK_ERRORS			= ( 'E155004', 'E200033', 'database is locked' )
+LOCK_RETRY_DELAYS	= ( 0.25, 0.5, 1, 2 )
 
 class SVN():
 	binary 			= None
 	log_commands	= False
+	timeouts		= dict()
 
 	@classmethod
-	def init( cls, binary = None, log_commands = False ):
+	def init( cls, binary = None, log_commands = False, timeouts = None ):
 		if binary is None:
 			raise OSError( 'An SVN binary needs to be configured in the SVNPlugin settings' )
 		elif not os.path.isfile( binary ):
@@ -17,15 +32,33 @@ class SVN():
 
 		cls.binary 			= binary
 		cls.log_commands	= log_commands
+		cls.timeouts		= timeouts if isinstance( timeouts, dict ) else dict()
+
+	@classmethod
+	def timeout( cls, args ):
+		timeout = cls.timeouts.get( args[ 0 ], cls.timeouts.get( 'default' ) )
+
+		if type( timeout ) not in ( int, float ) or timeout <= 0:
+			return None
+
+		return timeout
 
 	def __init__( self, cwd = '/tmp' ):
-		self.cwd		= cwd
-		self.results	= dict()
+		self.cwd = cwd
 
 	def info( self, path ):
 		return self.run_command( [ 'info', '--xml', path ] )
 
+	def info_entries( self, path ):
+		return self.records( [ 'info', '--xml', path ], records.iter_info )
+
 	def log( self, path, xml = True, stop_on_copy = True, limit = None, revision = None ):
+		return self.run_command( self.log_args( path, xml, stop_on_copy, limit, revision ) )
+
+	def log_entries( self, path, stop_on_copy = True, limit = None, revision = None ):
+		return self.records( self.log_args( path, True, stop_on_copy, limit, revision ), records.iter_log )
+
+	def log_args( self, path, xml, stop_on_copy, limit, revision ):
 		args = [ 'log', '--verbose' ]
 
 		if xml:
@@ -37,12 +70,15 @@ class SVN():
 		if limit:
 			args.extend( [ '--limit', limit ] )
 
-		if revision:
+		if isinstance( revision, list ):
+			for value in revision:
+				args.extend( [ '--revision', value ] )
+		elif revision:
 			args.extend( [ '--revision', revision ] )
 
 		args.append( path )
 
-		return self.run_command( args )
+		return args
 
 	def add( self, path ):
 		return self.run_command( [ 'add', path ] )
@@ -69,6 +105,16 @@ class SVN():
 
 		return self.run_command( args )
 
+	def annotate_entries( self, path, revision ):
+		args = [ 'annotate', '--xml' ]
+
+		if revision is not None:
+			args.extend( [ '--revision', revision ] )
+
+		args.append( path )
+
+		return self.records( args, records.iter_blame )
+
 	def diff( self, path, revision = None, change = None, diff_tool = None ):
 		args 	= [ 'diff' ]
 		block	= False if diff_tool else True
@@ -102,6 +148,12 @@ class SVN():
 		return self.run_command( [ 'update', path, '--accept', 'postpone' ] )
 
 	def status( self, path, xml = True, quiet = False ):
+		return self.run_command( self.status_args( path, xml, quiet ) )
+
+	def status_entries( self, path ):
+		return self.records( self.status_args( path, True, False ), records.iter_status )
+
+	def status_args( self, path, xml, quiet ):
 		args = [ 'status' ]
 
 		if xml:
@@ -110,33 +162,156 @@ class SVN():
 		if quiet:
 			args.append( '--quiet' )
 
-		args.append( path )
+		if isinstance( path, list ):
+			args.extend( path )
+		else:
+			args.append( path )
 
-		return self.run_command( args )
+		return args
 
 	def ls( self, path ):
 		return self.run_command( [ 'ls', '--xml', path ] )
 
-	def run_command( self, args, block = True ):
-		args.insert( 0, SVN.binary )
+	def list_entries( self, path ):
+		return self.records( [ 'ls', '--xml', path ], records.iter_list )
 
-		command = ' '.join( [ shlex.quote( str( arg ) ) for arg in args ] )
+	def argv( self, args ):
+		argv = [ SVN.binary ] + [ str( arg ) for arg in args ]
 
 		if SVN.log_commands:
-			print( 'SVN Command:', command )
+			print( 'SVN Command:', ' '.join( [ shlex.quote( arg ) for arg in argv ] ) )
+
+		return argv
+
+	def records( self, args, parser, timeout = None ):
+		return self.shared( args, parser, timeout )
 
+	def run_command( self, args, block = True, timeout = None ):
 		if not block:
-			subprocess.Popen( command, shell = True, cwd = self.cwd )
+			try:
+				Process.spawn( self.argv( args ), cwd = self.cwd )
+			except OSError as e:
+				return Result.failure( str( e ), args )
+
+			return Result( args, 0 )
+
+		return self.shared( args, None, timeout )
+
+	def shared( self, args, parser, timeout = None ):
+		flight, leader = self.board( args, parser )
+
+		if flight is not None and not leader:
+			result = flight.wait()
+
+			# results are immutable, so every passenger gets the very same one
+			if result is not None:
+				return result
+
+			if self.cancelled():
+				return Result.failure( 'Cancelled', args )
+
+			flight = None
+
+		result = None
+
+		try:
+			result = self.execute( args, parser, timeout )
+		finally:
+			# a cancelled flight leaves the other passengers to run their own command
+			if flight is not None:
+				flight.land( None if self.cancelled() else result )
+
+		return result
+
+	def execute( self, args, parser, timeout = None ):
+		for delay in LOCK_RETRY_DELAYS + ( None, ):
+			try:
+				with self.locked( args ):
+					result = self.attempt( args, parser, timeout )
+			except WorkingCopyLockError as e:
+				return Result.failure( str( e ), args )
+
+			# the UI thread never waits for another svn process to let go of the working copy
+			if result or delay is None or not self.retry( result ) or threading.current_thread().name == 'MainThread':
+				return result
+
+			time.sleep( delay )
+
+	def attempt( self, args, parser, timeout = None ):
+		try:
+			process	= self.start( args, timeout )
+		except OSError as e:
+			return Result.failure( str( e ), args )
+
+		output	= ''
+		payload	= None
+		error	= None
+
+		try:
+			if parser is None:
+				output	= process.read()
+			else:
+				# parsed while svn writes, so no output is held in memory, but only handed over once it is done
+				payload	= tuple( parser( process.stdout ) )
+		except ET.ParseError:
+			error = 'Failed to parse XML'
+		finally:
+			self.finish( process )
+
+		returncode	= process.returncode
+		stderr		= process.error
+
+		if error is not None:
+			returncode	= returncode or 1
+			stderr		= stderr or error
+
+		return Result( args, returncode, output, stderr, payload, process.started, process.duration )
+
+	def board( self, args, parser = None ):
+		# only commands that leave the working copy alone can share a process
+		if args[ 0 ] not in READ_ONLY_COMMANDS:
+			return None, False
+
+		return Flight.board( ( tuple( [ str( arg ) for arg in args ] ), self.cwd, parser ) )
+
+	def locked( self, args ):
+		paths	= [ str( arg ) for arg in args[ 1 : ] if os.path.isabs( str( arg ) ) ]
+		root	= WorkingCopyDatabase.find_root( paths[ -1 ] ) if paths else None
+
+		# reads share a working copy, anything that writes to it has it to itself,
+		# except on the UI thread, which must never wait for an update to finish and relies on svn's own locks instead
+		if root is None or threading.current_thread().name == 'MainThread':
+			return WorkingCopyLock.unlocked()
+		elif args[ 0 ] in READ_ONLY_COMMANDS:
+			return WorkingCopyLock.for_root( root ).reading()
+
+		return WorkingCopyLock.for_root( root ).writing()
+
+	def retry( self, result ):
+		if result or self.cancelled():
+			return False
+
+		# svn reports a locked working copy before doing anything, so trying again is safe
+		return any( [ code in result.error for code in LOCK_ERRORS ] )
+
+	def cancelled( self ):
+		operation = Operation.current()
+
+		return operation is not None and operation.cancelled
+
+	def start( self, args, timeout = None, argv = None ):
+		process		= Process( argv or self.argv( args ), cwd = self.cwd, timeout = timeout or SVN.timeout( args ) )
+		operation	= Operation.current()
 
-			self.results = { 'returncode': 0, 'stdout': '', 'stderr': '' }
+		if operation is not None:
+			operation.attach( process )
 
-			return True
+		return process
 
-		process			= subprocess.Popen( command, stdout = subprocess.PIPE, stderr = subprocess.PIPE, shell = True, cwd = self.cwd )
-		stdout, stderr	= process.communicate()
-		stdout 			= stdout.decode()
-		stderr 			= stderr.decode()
+	def finish( self, process ):
+		process.wait()
 
-		self.results = { 'returncode': process.returncode, 'stdout': stdout, 'stderr': stderr }
+		operation = Operation.current()
 
-		return True if self.results[ 'returncode' ] == 0 else False
+		if operation is not None:
+			operation.detach( process )
@@ -14,6 +14,9 @@ class ThreadProgress():
 
 	def run( self, i ):
 		if not self.thread.is_alive():
+			if hasattr( self.thread, 'operation' ) and self.thread.operation.cancelled:
+				return sublime.status_message( '{0} cancelled' . format( self.message ) )
+
 			if hasattr( self.thread, 'result' ) and not self.thread.result:
 				return sublime.status_message('')
 
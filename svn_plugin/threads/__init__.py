@@ -3,6 +3,7 @@ from .diff_path 			import DiffPathThread
 from .log_path	 			import LogPathThread
 from .revision_file 		import RevisionFileThread
 from .revision_list_load 	import RevisionListLoadThread
+from .revision_prefetch 	import RevisionPrefetchThread
 from .update_path 			import UpdatePathThread
 
 __all__ = [
@@ -11,5 +12,6 @@ __all__ = [
 	'LogPathThread',
 	'RevisionFileThread',
 	'RevisionListLoadThread',
+	'RevisionPrefetchThread',
 	'UpdatePathThread'
 ]
@@ -1,12 +1,9 @@
-import sublime
-import threading
+from .svn_thread import SvnThread
 
-class AnnotateFileThread( threading.Thread ):
+class AnnotateFileThread( SvnThread ):
 	def __init__( self, repository, revision, on_complete ):
-		self.repository 	= repository
 		self.revision		= revision
-		self.on_complete	= on_complete
-		threading.Thread.__init__( self )
+		SvnThread.__init__( self, repository, 'Annotate {0}' . format( repository.path ), on_complete )
 
-	def run( self ):
-		self.on_complete( self.repository.annotate( revision = self.revision ) )
+	def execute( self ):
+		return self.repository.annotation( revision = self.revision )
@@ -0,0 +1,9 @@
+from .svn_thread import SvnThread
+
+class CommandTaskThread( SvnThread ):
+	def __init__( self, name, work, on_complete ):
+		self.work = work
+		SvnThread.__init__( self, None, name, on_complete )
+
+	def execute( self ):
+		return self.work()
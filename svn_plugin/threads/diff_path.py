@@ -1,13 +1,11 @@
-import threading
+from .svn_thread import SvnThread
 
-class DiffPathThread( threading.Thread ):
+class DiffPathThread( SvnThread ):
 	def __init__( self, repository, revision_number, change_number, diff_tool, on_complete ):
-		self.repository			= repository
 		self.revision_number	= revision_number
 		self.change_number		= change_number
 		self.diff_tool			= diff_tool
-		self.on_complete		= on_complete
-		threading.Thread.__init__( self )
+		SvnThread.__init__( self, repository, 'Diff {0}' . format( repository.path ), on_complete )
 
-	def run( self ):
-		self.on_complete( self.repository.diff( revision_number = self.revision_number, change_number = self.change_number, diff_tool = self.diff_tool ) )
+	def execute( self ):
+		return self.repository.diff( revision_number = self.revision_number, change_number = self.change_number, diff_tool = self.diff_tool )
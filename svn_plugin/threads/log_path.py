@@ -1,11 +1,9 @@
-import threading
+from .svn_thread import SvnThread
 
-class LogPathThread( threading.Thread ):
+class LogPathThread( SvnThread ):
 	def __init__( self, repository, limit, on_complete ):
-		self.repository 	= repository
 		self.limit			= limit
-		self.on_complete	= on_complete
-		threading.Thread.__init__( self )
+		SvnThread.__init__( self, repository, 'Log {0}' . format( repository.path ), on_complete )
 
-	def run( self ):
-		self.on_complete( self.repository.log( xml = False, limit = self.limit ) )
+	def execute( self ):
+		return self.repository.log_entries( limit = self.limit )
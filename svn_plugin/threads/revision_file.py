@@ -1,12 +1,9 @@
-import sublime
-import threading
+from .svn_thread import SvnThread
 
-class RevisionFileThread( threading.Thread ):
+class RevisionFileThread( SvnThread ):
 	def __init__( self, repository, revision, on_complete ):
-		self.repository 	= repository
 		self.revision		= revision
-		self.on_complete	= on_complete
-		threading.Thread.__init__( self )
+		SvnThread.__init__( self, repository, 'Cat {0}@{1}' . format( repository.path, revision ), on_complete )
 
-	def run( self ):
-		self.on_complete( self.repository.cat( revision = self.revision ) )
+	def execute( self ):
+		return self.repository.cat( revision = self.revision )
@@ -1,14 +1,11 @@
-import sublime
-import threading
+from .svn_thread import SvnThread
 
-class RevisionListLoadThread( threading.Thread ):
+class RevisionListLoadThread( SvnThread ):
 	def __init__( self, repository, log_limit, stop_on_copy, revision, on_complete ):
-		self.repository 	= repository
 		self.stop_on_copy	= stop_on_copy
 		self.log_limit		= log_limit
 		self.revision		= revision
-		self.on_complete	= on_complete
-		threading.Thread.__init__( self )
+		SvnThread.__init__( self, repository, 'Revisions {0}' . format( repository.path ), on_complete )
 
-	def run( self ):
-		self.on_complete( self.repository.log( self.log_limit, self.stop_on_copy, self.revision ) )
+	def execute( self ):
+		return self.repository.log_entries( limit = self.log_limit, stop_on_copy = self.stop_on_copy, before = self.revision )
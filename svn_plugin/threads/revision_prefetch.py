@@ -0,0 +1,25 @@
+from .svn_thread		import SvnThread
+from ..scheduler	import PRIORITY_BACKGROUND
+from ..result		import Result
+
+class RevisionPrefetchThread( SvnThread ):
+	def __init__( self, repository, revisions, diff ):
+		self.revisions	= revisions
+		self.diff		= diff
+		SvnThread.__init__( self, repository, 'Prefetch {0}@{1}' . format( repository.path, ',' . join( revisions ) ), self.prefetched, priority = PRIORITY_BACKGROUND )
+
+	def execute( self ):
+		# the repository keeps what was fetched, a cancelled fetch just doesn't get cached
+		for revision in self.revisions:
+			if self.operation.cancelled:
+				break
+
+			self.repository.cat( revision = revision )
+
+			if self.diff and not self.operation.cancelled:
+				self.repository.diff( change_number = revision )
+
+		return Result.local()
+
+	def prefetched( self, result ):
+		pass
@@ -1,10 +1,8 @@
-import threading
+from .svn_thread import SvnThread
 
-class StatusPathThread( threading.Thread ):
+class StatusPathThread( SvnThread ):
 	def __init__( self, repository, on_complete ):
-		self.repository 	= repository
-		self.on_complete	= on_complete
-		threading.Thread.__init__( self )
+		SvnThread.__init__( self, repository, 'Status {0}' . format( repository.path ), on_complete )
 
-	def run( self ):
-		self.on_complete( self.repository.status( xml = False, quiet = True ) )
+	def execute( self ):
+		return self.repository.status( xml = False, quiet = True )
@@ -0,0 +1,45 @@
+import abc
+
+from ..operation	import Operation
+from ..scheduler	import Scheduler, PRIORITY_USER, PRIORITY_BACKGROUND
+from ..wc_db		import WorkingCopyDatabase
+
+class SvnThread( metaclass = abc.ABCMeta ):
+	def __init__( self, repository, name, on_complete, priority = PRIORITY_USER ):
+		self.repository		= repository
+		self.operation		= Operation( name, background = priority == PRIORITY_BACKGROUND )
+		self.on_complete	= on_complete
+		self.priority		= priority
+		self.task			= None
+		self.result			= None
+
+	def start( self ):
+		# work on one working copy is limited so a long update can't take every worker
+		key 		= WorkingCopyDatabase.find_root( self.repository.path ) or self.repository.path if self.repository is not None else None
+		self.task	= Scheduler.submit( self.run, priority = self.priority, key = key, name = self.operation.name )
+
+	def is_alive( self ):
+		return self.task is not None and not self.task.is_done()
+
+	def join( self, timeout = None ):
+		if self.task is not None:
+			self.task.wait( timeout )
+
+	def run( self ):
+		if not self.operation.cancelled:
+			with self.operation:
+				self.result = self.execute()
+
+		# a cancelled operation leaves nothing behind to report
+		if self.operation.cancelled:
+			self.result = False
+			return
+
+		self.on_complete( self.result )
+
+	@abc.abstractmethod
+	def execute( self ):
+		pass
+
+	def cancel( self ):
+		self.operation.cancel()
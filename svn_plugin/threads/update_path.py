@@ -1,10 +1,8 @@
-import threading
+from .svn_thread import SvnThread
 
-class UpdatePathThread( threading.Thread ):
+class UpdatePathThread( SvnThread ):
 	def __init__( self, repository, on_complete ):
-		self.repository 	= repository
-		self.on_complete	= on_complete
-		threading.Thread.__init__( self )
+		SvnThread.__init__( self, repository, 'Update {0}' . format( repository.path ), on_complete )
 
-	def run( self ):
-		self.on_complete( self.repository.update() )
+	def execute( self ):
+		return self.repository.update()
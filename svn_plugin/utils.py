@@ -1,58 +1,99 @@
 import os
+import threading
 
-from .cache import Cache
-from .repository import Repository
+from .cache 		import MISSING
+from .repository 	import Repository
+from .result		import Result
+from .scheduler		import Scheduler, PRIORITY_BACKGROUND
+from .thread_progress 			import ThreadProgress
+from .threads.command_task 		import CommandTaskThread
+from .wc_db						import svn_roots, remember_svn_root
 
-def has_svn_root( path ):
-	if path is None:
-		return False
-
-	if os.path.isdir( path ):
-		folder = path
-	else:
-		folder = os.path.dirname( path )
+warming			= set()
+warming_lock	= threading.Lock()
 
-	return True if find_svn_root( folder ) is not None else False
+def has_svn_root( path ):
+	return True if find_svn_root( path ) is not None else False
 
 def find_svn_root( path ):
 	if path is None:
 		return None
 
-	if os.path.isfile( path ):
-		folder = os.path.dirname( path )
-	else:
-		folder = path
+	# paths that were looked up before are answered without touching the disk
+	root, fresh = svn_roots.lookup( path )
 
-	original_folder	= folder
+	if fresh:
+		return root
+
+	folder 			= os.path.dirname( path ) if os.path.isfile( path ) else path
 	current_folder 	= folder
 	last_folder		= None
+	visited			= [ path ]
+	root			= None
 
 	while current_folder != last_folder:
-		svn_path = os.path.join( current_folder, '.svn' )
+		root, fresh = svn_roots.lookup( current_folder )
 
-		if not os.path.isdir( svn_path ):
-			last_folder 	= current_folder
-			current_folder	= os.path.dirname( current_folder )
-		else:
-			if current_folder in Cache.folders:
-				if Cache.folders[ current_folder ]:
-					return current_folder
-				else:
-					return None
+		if fresh:
+			break
 
-			Cache.folders[ current_folder ] = Repository( current_folder ).is_tracked()
+		visited.append( current_folder )
 
-			if Cache.folders[ current_folder ]:
-				return current_folder
-			else:
-				return None
+		if os.path.isdir( os.path.join( current_folder, '.svn' ) ):
+			root = current_folder if Repository( current_folder ).is_tracked() else None
+			break
+
+		last_folder 	= current_folder
+		current_folder	= os.path.dirname( current_folder )
+	else:
+		root = None
 
-	Cache.folders[ original_folder ] = None
+	# the walk stops at the first .svn folder, so every folder on the way shares its answer
+	for visited_path in visited:
+		remember_svn_root( visited_path, root )
+
+	return root
 
 def in_svn_root( path ):
-	return True if has_svn_root( path ) == True else False
+	# menus ask on every render, so an old answer is kept while it is looked up again in the background,
+	# only paths that were never looked up are hidden until then
+	root, fresh = svn_roots.lookup( path )
+
+	if not fresh:
+		warm_svn_root( path )
+
+	return root is not MISSING and root is not None
+
+def warm_svn_root( path ):
+	if path is None:
+		return
+
+	with warming_lock:
+		if path in warming:
+			return
+
+		warming.add( path )
+
+	def warm():
+		try:
+			find_svn_root( path )
+		finally:
+			with warming_lock:
+				warming.discard( path )
+
+	Scheduler.submit( warm, priority = PRIORITY_BACKGROUND, name = 'Find working copy of {0}' . format( path ) )
 
 class SvnPluginCommand():
+	def run_in_svn_root( self, command, path ):
+		if in_svn_root( path ):
+			return self.window.run_command( command, { 'path': path } )
+
+		self.run_async( 'Checking {0}' . format( path ), lambda: find_svn_root( path ), lambda root: self.run_in_svn_root_callback( command, path, root ) )
+
+	def run_in_svn_root_callback( self, command, path, root ):
+		if root is not None:
+			self.window.run_command( command, { 'path': path } )
+
 	def get_folder( self, path = None ):
 		if path is None:
 			if hasattr( self, 'window' ):
@@ -74,6 +115,25 @@ class SvnPluginCommand():
 
 		return None
 
+	def tracked_repository( self, path, file_path = None ):
+		if path is None:
+			path = find_svn_root( file_path )
+
+			if path is None:
+				return None
+
+		repository = Repository( path )
+
+		if not repository.is_tracked():
+			return Result.failure( '{0} is not under version control' . format( path ) )
+
+		return Result.local( payload = repository )
+
+	def run_async( self, message, work, on_complete ):
+		thread = CommandTaskThread( message, work, on_complete )
+		thread.start()
+		ThreadProgress( thread, message )
+
 	def get_file( self ):
 		if hasattr( self, 'window' ):
 			file = self.window.active_view().file_name()
@@ -0,0 +1,235 @@
+import os
+import sys
+import abc
+import errno
+import select
+import struct
+import threading
+
+try:
+	import ctypes
+	import ctypes.util
+except ImportError:
+	ctypes = None
+
+IN_MODIFY		= 0x00000002
+IN_ATTRIB		= 0x00000004
+IN_CLOSE_WRITE	= 0x00000008
+IN_MOVED_FROM	= 0x00000040
+IN_MOVED_TO		= 0x00000080
+IN_CREATE		= 0x00000100
+IN_DELETE		= 0x00000200
+IN_DELETE_SELF	= 0x00000400
+IN_MOVE_SELF	= 0x00000800
+IN_Q_OVERFLOW	= 0x00004000
+IN_IGNORED		= 0x00008000
+IN_ONLYDIR		= 0x01000000
+IN_ISDIR		= 0x40000000
+IN_NONBLOCK		= 0x00000800
+IN_CLOEXEC		= 0x00080000
+
+WATCH_MASK		= IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+EVENT_HEADER	= struct.Struct( 'iIII' )
+
+class WatcherError( Exception ):
+	pass
+
+def walk_directories( root ):
+	for folder, folders, files in os.walk( root ):
+		folders[ : ] = [ name for name in folders if name != '.svn' ]
+
+		yield folder, folders, files
+
+class Watcher( metaclass = abc.ABCMeta ):
+	@classmethod
+	def create( cls, root, on_change, poll_interval = 5 ):
+		if InotifyWatcher.available():
+			try:
+				return InotifyWatcher( root, on_change )
+			except WatcherError:
+				pass
+
+		return PollingWatcher( root, on_change, poll_interval )
+
+	def __init__( self, root, on_change ):
+		self.root 		= root
+		self.on_change	= on_change
+		self.stopped	= threading.Event()
+		self.thread		= None
+
+	def start( self ):
+		self.thread 		= threading.Thread( target = self.watch, name = 'SVNPlugin watcher {0}' . format( self.root ) )
+		self.thread.daemon	= True
+		self.thread.start()
+
+	def stop( self ):
+		self.stopped.set()
+
+	def ignored( self, path ):
+		return '{0}.svn{0}' . format( os.sep ) in path + os.sep
+
+	def changed( self, paths ):
+		paths = [ path for path in paths if not self.ignored( path ) ]
+
+		if paths:
+			self.on_change( paths )
+
+	@abc.abstractmethod
+	def watch( self ):
+		pass
+
+class InotifyWatcher( Watcher ):
+	libc = None
+
+	@classmethod
+	def available( cls ):
+		if not sys.platform.startswith( 'linux' ) or ctypes is None:
+			return False
+
+		if cls.libc is None:
+			try:
+				cls.libc = ctypes.CDLL( ctypes.util.find_library( 'c' ) or 'libc.so.6', use_errno = True )
+				cls.libc.inotify_init1
+				cls.libc.inotify_add_watch
+			except ( OSError, AttributeError ):
+				cls.libc = False
+
+		return bool( cls.libc )
+
+	def __init__( self, root, on_change ):
+		Watcher.__init__( self, root, on_change )
+
+		self.descriptors	= dict()
+		self.fd 			= self.libc.inotify_init1( IN_NONBLOCK | IN_CLOEXEC )
+
+		if self.fd < 0:
+			raise WatcherError( os.strerror( ctypes.get_errno() ) )
+
+		try:
+			self.add_tree( self.root )
+		except WatcherError:
+			os.close( self.fd )
+			raise
+
+	def add_tree( self, root ):
+		for folder, folders, files in walk_directories( root ):
+			self.add_watch( folder )
+
+	def add_watch( self, folder ):
+		descriptor = self.libc.inotify_add_watch( self.fd, os.fsencode( folder ), WATCH_MASK )
+
+		if descriptor < 0:
+			error = ctypes.get_errno()
+
+			# the folder vanished before we got to it, nothing to watch
+			if error in ( errno.ENOENT, errno.ENOTDIR ):
+				return
+
+			raise WatcherError( 'Failed to watch {0}: {1}' . format( folder, os.strerror( error ) ) )
+
+		self.descriptors[ descriptor ] = folder
+
+	def watch( self ):
+		try:
+			while not self.stopped.is_set():
+				readable, _, _ = select.select( [ self.fd ], [], [], 1 )
+
+				if readable:
+					self.changed( self.read_events() )
+		finally:
+			os.close( self.fd )
+
+	def read_events( self ):
+		try:
+			data = os.read( self.fd, 65536 )
+		except OSError as e:
+			if e.errno == errno.EAGAIN:
+				return []
+
+			raise
+
+		paths 	= []
+		offset	= 0
+
+		while offset + EVENT_HEADER.size <= len( data ):
+			descriptor, mask, cookie, length = EVENT_HEADER.unpack_from( data, offset )
+			name 	= data[ offset + EVENT_HEADER.size : offset + EVENT_HEADER.size + length ].rstrip( b'\0' )
+			offset += EVENT_HEADER.size + length
+
+			if mask & IN_Q_OVERFLOW:
+				paths.append( self.root )
+				continue
+
+			folder = self.descriptors.get( descriptor )
+
+			if folder is None:
+				continue
+
+			if mask & IN_IGNORED:
+				del self.descriptors[ descriptor ]
+				continue
+
+			path = os.path.join( folder, os.fsdecode( name ) ) if name else folder
+
+			if mask & IN_ISDIR and mask & ( IN_CREATE | IN_MOVED_TO ) and not self.ignored( path ):
+				try:
+					self.add_tree( path )
+				except WatcherError:
+					# out of watches, fall back to a full refresh whenever this tree changes
+					paths.append( self.root )
+
+			paths.append( path )
+
+		return paths
+
+class PollingWatcher( Watcher ):
+	def __init__( self, root, on_change, poll_interval ):
+		Watcher.__init__( self, root, on_change )
+
+		self.poll_interval	= poll_interval
+		self.folders		= dict()
+
+		for folder, folders, files in walk_directories( self.root ):
+			self.folders[ folder ] = self.snapshot( folder )
+
+	def snapshot( self, folder ):
+		try:
+			return ( os.stat( folder ).st_mtime, set( os.listdir( folder ) ) )
+		except OSError:
+			return None
+
+	def watch( self ):
+		while not self.stopped.wait( self.poll_interval ):
+			self.changed( self.poll() )
+
+	def poll( self ):
+		paths = []
+
+		for folder, previous in list( self.folders.items() ):
+			try:
+				mtime = os.stat( folder ).st_mtime
+			except OSError:
+				del self.folders[ folder ]
+				paths.append( folder )
+				continue
+
+			if previous is not None and mtime == previous[ 0 ]:
+				continue
+
+			current 				= self.snapshot( folder )
+			self.folders[ folder ]	= current
+
+			if previous is None or current is None:
+				paths.append( folder )
+				continue
+
+			for name in previous[ 1 ].symmetric_difference( current[ 1 ] ):
+				path = os.path.join( folder, name )
+
+				if name != '.svn' and os.path.isdir( path ):
+					for child, folders, files in walk_directories( path ):
+						self.folders[ child ] = self.snapshot( child )
+
+				paths.append( path )
+
+		return paths
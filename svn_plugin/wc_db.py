@@ -0,0 +1,266 @@
+import os
+import threading
+import urllib.parse
+import urllib.request
+
+from .cache import Cache
+
+try:
+	import sqlite3
+except ImportError:
+	sqlite3 = None
+
+TRACKED_PRESENCES 	= ( 'normal', 'incomplete', 'base-deleted' )
+TRANSLATING_PROPERTIES	= ( b'svn:keywords', b'svn:eol-style', b'svn:special' )
+CHUNK_SIZE				= 65536
+ROOT_TTL				= 300
+UNTRACKED_TTL			= 30
+
+svn_roots = Cache.region( 'svn_roots', max_entries = 4096, paths = True )
+
+def remember_svn_root( path, root ):
+	# folders can be checked out or have their working copy removed, so neither answer is kept forever
+	return svn_roots.put( path, root, ttl = ROOT_TTL if root is not None else UNTRACKED_TTL )
+
+class WorkingCopyDatabaseError( Exception ):
+	pass
+
+class WorkingCopyDatabase():
+	databases	= dict()
+	lock		= threading.Lock()
+
+	@classmethod
+	def find_root( cls, path ):
+		if path is None:
+			return None
+
+		# every svn call, task and working copy asks for its root, so the walk shares the index of the menus
+		current_folder	= os.path.abspath( path )
+		last_folder		= None
+		visited			= []
+		root			= None
+
+		while current_folder != last_folder:
+			known, fresh = svn_roots.lookup( current_folder )
+
+			if fresh:
+				root = known
+				break
+
+			visited.append( current_folder )
+			svn_path = os.path.join( current_folder, '.svn' )
+
+			if os.path.isdir( svn_path ):
+				# pre 1.7 working copies have a .svn folder in every directory and no wc.db
+				root = current_folder if os.path.isfile( os.path.join( svn_path, 'wc.db' ) ) else None
+				break
+
+			last_folder 	= current_folder
+			current_folder	= os.path.dirname( current_folder )
+
+		for visited_path in visited:
+			remember_svn_root( visited_path, root )
+
+		return root
+
+	@classmethod
+	def for_path( cls, path ):
+		if sqlite3 is None:
+			return None
+
+		root = cls.find_root( path )
+
+		if root is None:
+			return None
+
+		with cls.lock:
+			if root not in cls.databases:
+				cls.databases[ root ] = WorkingCopyDatabase( root )
+
+			return cls.databases[ root ]
+
+	@classmethod
+	def close_all( cls ):
+		with cls.lock:
+			for database in cls.databases.values():
+				database.close()
+
+			cls.databases.clear()
+
+	def __init__( self, root ):
+		self.root 			= root
+		self.path			= os.path.join( root, '.svn', 'wc.db' )
+		self.connection		= None
+		self.repositories	= dict()
+		self.lock			= threading.Lock()
+
+	def connect( self ):
+		if self.connection is not None:
+			return self.connection
+
+		uri = 'file:{0}?mode=ro' . format( urllib.request.pathname2url( self.path ) )
+
+		try:
+			try:
+				self.connection = sqlite3.connect( uri, uri = True, timeout = 1, check_same_thread = False )
+			except TypeError:
+				self.connection = sqlite3.connect( self.path, timeout = 1, check_same_thread = False )
+
+		except sqlite3.Error as e:
+			self.close()
+			raise WorkingCopyDatabaseError( 'Failed to open {0}: {1}' . format( self.path, str( e ) ) )
+
+		return self.connection
+
+	def close( self ):
+		if self.connection is not None:
+			try:
+				self.connection.close()
+			except sqlite3.Error:
+				pass
+
+		self.connection = None
+		self.repositories.clear()
+
+	def query( self, sql, parameters = () ):
+		with self.lock:
+			if not os.path.isfile( self.path ):
+				self.close()
+				raise WorkingCopyDatabaseError( 'Failed to find {0}' . format( self.path ) )
+
+			connection = self.connect()
+
+			try:
+				return connection.execute( sql, parameters ).fetchall()
+			except sqlite3.Error as e:
+				self.close()
+				raise WorkingCopyDatabaseError( 'Failed to query {0}: {1}' . format( self.path, str( e ) ) )
+
+	def relpath( self, path ):
+		relpath = os.path.relpath( os.path.abspath( path ), self.root )
+
+		if relpath == os.curdir:
+			return ''
+
+		return relpath.replace( os.sep, '/' )
+
+	def repository( self, repos_id ):
+		if repos_id in self.repositories:
+			return self.repositories[ repos_id ]
+
+		rows = self.query( 'SELECT root, uuid FROM repository WHERE id = ?', ( repos_id, ) )
+
+		if not rows:
+			return None
+
+		self.repositories[ repos_id ] = { 'root': rows[ 0 ][ 0 ], 'uuid': rows[ 0 ][ 1 ] }
+
+		return self.repositories[ repos_id ]
+
+	def node( self, path ):
+		rows = self.query( 'SELECT op_depth, presence, kind, revision, repos_id, repos_path, checksum, translated_size, last_mod_time, changed_revision, properties '
+						   'FROM nodes WHERE wc_id = ( SELECT id FROM wcroot WHERE local_abspath IS NULL ) AND local_relpath = ? ORDER BY op_depth DESC', ( self.relpath( path ), ) )
+
+		if not rows:
+			return None
+
+		working	= rows[ 0 ]
+		base	= rows[ -1 ] if rows[ -1 ][ 0 ] == 0 else None
+		node	= { 'path': path, 'presence': working[ 1 ], 'kind': working[ 2 ], 'op_depth': working[ 0 ], 'tracked': working[ 1 ] in TRACKED_PRESENCES,
+					'checksum': working[ 6 ], 'translated_size': working[ 7 ], 'last_mod_time': working[ 8 ], 'properties': working[ 10 ],
+					'revision': None, 'changed_revision': None, 'url': None, 'uuid': None, 'repos_path': None }
+
+		if base is not None:
+			repository = self.repository( base[ 4 ] )
+
+			node[ 'revision' ]			= base[ 3 ]
+			node[ 'changed_revision' ]	= base[ 9 ]
+			node[ 'repos_path' ]		= base[ 5 ]
+
+			if repository is not None:
+				node[ 'uuid' ]	= repository[ 'uuid' ]
+				node[ 'url' ]	= repository[ 'root' ]
+
+				if base[ 5 ]:
+					node[ 'url' ] = '{0}/{1}' . format( repository[ 'root' ].rstrip( '/' ), urllib.parse.quote( base[ 5 ] ) )
+
+		return node
+
+
+	def actual_node( self, path ):
+		rows = self.query( 'SELECT properties, conflict_old, conflict_new, conflict_working, prop_reject, tree_conflict_data, conflict_data '
+						   'FROM actual_node WHERE wc_id = ( SELECT id FROM wcroot WHERE local_abspath IS NULL ) AND local_relpath = ?', ( self.relpath( path ), ) )
+
+		if not rows:
+			return None
+
+		return { 'properties': rows[ 0 ][ 0 ], 'conflicted': any( value is not None for value in rows[ 0 ][ 1 : ] ) }
+
+	def pristine_path( self, checksum ):
+		if not checksum or not checksum.startswith( '$sha1$' ):
+			return None
+
+		digest = checksum[ 6 : ]
+
+		return os.path.join( self.root, '.svn', 'pristine', digest[ : 2 ], '{0}.svn-base' . format( digest ) )
+
+	def is_modified( self, path ):
+		# mirrors svn's own quick check, returns None whenever only svn itself can tell
+		node = self.node( path )
+
+		if node is None or not node[ 'tracked' ]:
+			return None
+
+		# only the root of an add, copy or move is changed by it, what was copied along with it is reported as normal
+		if node[ 'op_depth' ] > 0:
+			if node[ 'presence' ] == 'base-deleted' or node[ 'op_depth' ] == len( self.relpath( path ).split( '/' ) ):
+				return True
+
+			return None
+
+		if node[ 'kind' ] != 'file':
+			return None
+
+		actual 		= self.actual_node( path )
+		properties	= [ node[ 'properties' ] ]
+
+		if actual is not None:
+			if actual[ 'conflicted' ]:
+				return True
+
+			properties.append( actual[ 'properties' ] )
+
+		try:
+			stat = os.stat( path )
+		except OSError:
+			return None
+
+		if node[ 'translated_size' ] == stat.st_size and node[ 'last_mod_time' ] == stat.st_mtime_ns // 1000:
+			return False
+
+		for value in properties:
+			if value is not None and any( name in bytes( value ) for name in TRANSLATING_PROPERTIES ):
+				return None
+
+		if node[ 'translated_size' ] is not None and node[ 'translated_size' ] >= 0 and node[ 'translated_size' ] != stat.st_size:
+			return True
+
+		return self.differs_from_pristine( path, self.pristine_path( node[ 'checksum' ] ) )
+
+	def differs_from_pristine( self, path, pristine_path ):
+		if pristine_path is None:
+			return None
+
+		try:
+			with open( path, 'rb' ) as working, open( pristine_path, 'rb' ) as pristine:
+				while True:
+					working_chunk	= working.read( CHUNK_SIZE )
+					pristine_chunk	= pristine.read( CHUNK_SIZE )
+
+					if working_chunk != pristine_chunk:
+						return True
+
+					if not working_chunk:
+						return False
+		except OSError:
+			return None
@@ -0,0 +1,107 @@
+import threading
+import contextlib
+
+class WorkingCopyLockError( Exception ):
+	pass
+
+class WorkingCopyLock():
+	locks	= dict()
+	lock	= threading.Lock()
+
+	@classmethod
+	def for_root( cls, root ):
+		with cls.lock:
+			if root not in cls.locks:
+				cls.locks[ root ] = WorkingCopyLock( root )
+
+			return cls.locks[ root ]
+
+	@classmethod
+	@contextlib.contextmanager
+	def unlocked( cls ):
+		yield
+
+	def __init__( self, root ):
+		self.root				= root
+		self.condition			= threading.Condition()
+		self.readers			= dict()
+		self.writer				= None
+		self.writer_depth		= 0
+		self.waiting_writers	= 0
+
+	def acquire_read( self ):
+		thread = threading.get_ident()
+
+		with self.condition:
+			# a thread already reading or writing goes ahead, it would otherwise wait on itself
+			while not self.can_read( thread ):
+				self.condition.wait()
+
+			self.readers[ thread ] = self.readers.get( thread, 0 ) + 1
+
+	def can_read( self, thread ):
+		if thread in self.readers or self.writer == thread:
+			return True
+
+		return self.writer is None and not self.waiting_writers
+
+	def release_read( self ):
+		thread = threading.get_ident()
+
+		with self.condition:
+			self.readers[ thread ] -= 1
+
+			if not self.readers[ thread ]:
+				del self.readers[ thread ]
+
+			self.condition.notify_all()
+
+	def acquire_write( self ):
+		thread = threading.get_ident()
+
+		with self.condition:
+			if self.writer == thread:
+				self.writer_depth += 1
+				return
+
+			# two readers upgrading at the same time would wait on each other forever
+			if thread in self.readers:
+				raise WorkingCopyLockError( 'Cannot write to {0} while reading it' . format( self.root ) )
+
+			self.waiting_writers += 1
+
+			try:
+				while self.writer is not None or [ reader for reader in self.readers if reader != thread ]:
+					self.condition.wait()
+			finally:
+				self.waiting_writers -= 1
+
+			self.writer			= thread
+			self.writer_depth	= 1
+
+	def release_write( self ):
+		with self.condition:
+			self.writer_depth -= 1
+
+			if not self.writer_depth:
+				self.writer = None
+
+			self.condition.notify_all()
+
+	@contextlib.contextmanager
+	def reading( self ):
+		self.acquire_read()
+
+		try:
+			yield
+		finally:
+			self.release_read()
+
+	@contextlib.contextmanager
+	def writing( self ):
+		self.acquire_write()
+
+		try:
+			yield
+		finally:
+			self.release_write()
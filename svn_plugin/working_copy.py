@@ -0,0 +1,397 @@
+import os
+import threading
+import time
+
+from .settings	import Settings
+from .svn 		import SVN
+from .records	import StatusEntry
+from .scheduler	import Scheduler, PRIORITY_BACKGROUND
+from .watcher	import Watcher, walk_directories
+from .wc_db		import WorkingCopyDatabase, WorkingCopyDatabaseError, svn_roots
+
+MODIFIED_STATUSES 	= ( 'added', 'deleted', 'replaced', 'modified', 'merged', 'conflicted' )
+REFRESH_DELAY		= 0.5
+MAX_DIRTY_PATHS		= 500
+
+class WorkingCopy():
+	working_copies	= dict()
+	snapshots		= dict()
+	lock			= threading.Lock()
+
+	@classmethod
+	def for_path( cls, path ):
+		root = WorkingCopyDatabase.find_root( path )
+
+		if root is None:
+			return None
+
+		with cls.lock:
+			if root not in cls.working_copies:
+				cls.working_copies[ root ] = WorkingCopy( root )
+
+				# state saved before a restart is picked up the first time its working copy is used
+				if root in cls.snapshots:
+					cls.working_copies[ root ].restore( cls.snapshots.pop( root ) )
+
+				if Settings().svn_watch_working_copies():
+					cls.working_copies[ root ].watch()
+
+			return cls.working_copies[ root ]
+
+	@classmethod
+	def close_all( cls ):
+		with cls.lock:
+			for working_copy in cls.working_copies.values():
+				working_copy.close()
+
+			cls.working_copies.clear()
+
+	@classmethod
+	def all_snapshots( cls ):
+		with cls.lock:
+			snapshots 		= dict( cls.snapshots )
+			working_copies	= list( cls.working_copies.items() )
+
+		for root, working_copy in working_copies:
+			snapshot = working_copy.snapshot()
+
+			if snapshot is not None:
+				snapshots[ root ] = snapshot
+
+		return snapshots
+
+	@classmethod
+	def invalidate_path( cls, path ):
+		working_copy = cls.for_path( path )
+
+		if working_copy is not None:
+			working_copy.invalidate( path )
+
+	def __init__( self, root ):
+		self.root 		= root
+		self.statuses	= dict()
+		self.dirty		= set()
+		self.loaded		= False
+		self.verified	= False
+		self.verifying	= False
+		self.signature	= None
+		self.scanned_at	= 0
+		self.error		= None
+		self.watcher	= None
+		self.timer		= None
+		self.closed		= False
+		self.lock		= threading.RLock()
+		self.pending	= set()
+		self.reload		= False
+		self.pending_lock	= threading.Lock()
+		self.last_snapshot	= None
+
+	def watch( self ):
+		Scheduler.submit( self.start_watcher, priority = PRIORITY_BACKGROUND, key = self.root, name = 'Watch {0}' . format( self.root ) )
+
+	def start_watcher( self ):
+		watcher = Watcher.create( self.root, self.on_change, poll_interval = Settings().svn_watch_poll_interval() )
+
+		with self.pending_lock:
+			if self.closed:
+				return
+
+			self.watcher = watcher
+			self.watcher.start()
+
+	def close( self ):
+		# called from the UI thread on unload, so it never waits for a scan that holds the working copy lock
+		with self.pending_lock:
+			self.closed = True
+
+			if self.watcher is not None:
+				self.watcher.stop()
+
+			if self.timer is not None:
+				self.timer.cancel()
+
+	def on_change( self, paths ):
+		# only a folder that was checked out, switched or removed changes which working copy its files belong to,
+		# the old answer is kept until it is looked up again so the commands don't disappear in the meantime
+		svn_roots.expire_paths( [ path for path in paths if not os.path.isfile( path ) ] )
+
+		# changes seen while the first scan runs are kept as well, the scan may have passed them already
+		with self.pending_lock:
+			for path in paths:
+				if path == self.root:
+					self.reload = True
+				else:
+					self.pending.add( path )
+
+			if len( self.pending ) > MAX_DIRTY_PATHS:
+				self.pending.clear()
+				self.reload = True
+
+			if self.timer is not None:
+				self.timer.cancel()
+
+			self.timer 			= threading.Timer( REFRESH_DELAY, self.schedule_refresh )
+			self.timer.daemon	= True
+			self.timer.start()
+
+	def schedule_refresh( self ):
+		Scheduler.submit( self.background_refresh, priority = PRIORITY_BACKGROUND, key = self.root, name = 'Refresh {0}' . format( self.root ) )
+
+	def background_refresh( self ):
+		with self.pending_lock:
+			self.timer = None
+
+		with self.lock:
+			if self.loaded and not self.closed:
+				self.refresh()
+
+	def database_signature( self ):
+		try:
+			stat = os.stat( os.path.join( self.root, '.svn', 'wc.db' ) )
+		except OSError:
+			return None
+
+		return ( stat.st_mtime_ns, stat.st_size )
+
+	def invalidate( self, path = None ):
+		# called from the UI thread, so it never waits for a scan that holds the working copy lock
+		with self.pending_lock:
+			if path is None:
+				self.reload = True
+			else:
+				self.pending.add( os.path.abspath( path ) )
+
+	def take_pending( self ):
+		with self.pending_lock:
+			self.dirty.update( self.pending )
+			self.pending.clear()
+
+			if self.reload:
+				self.loaded = False
+				self.reload = False
+
+	def refresh( self, exact = False ):
+		with self.lock:
+			self.take_pending()
+
+			# a restored snapshot can miss what changed while the editor was closed, listings wait for a full scan
+			if exact and not self.verified:
+				self.loaded = False
+
+			signature = self.database_signature()
+
+			if not self.loaded or signature != self.signature:
+				self.dirty.clear()
+
+				if not self.scan( [ self.root ] ):
+					return False
+
+				self.loaded		= True
+				self.verified	= True
+				self.signature	= signature
+			elif self.dirty:
+				paths = self.dirty_paths()
+				self.dirty.clear()
+
+				if paths and not self.scan( paths ):
+					self.loaded = False
+					return False
+
+			if not self.verified and not self.verifying:
+				self.verifying = True
+				Scheduler.submit( self.verify, priority = PRIORITY_BACKGROUND, key = self.root, name = 'Verify {0}' . format( self.root ) )
+
+			return True
+
+	def verify( self ):
+		with self.lock:
+			self.verifying = False
+
+			if not self.verified and not self.closed:
+				self.refresh( exact = True )
+
+	def scan( self, paths ):
+		scanned_at	= time.time()
+		result		= SVN( self.root ).status_entries( paths )
+
+		if not result:
+			self.error = result.error
+			return False
+
+		statuses = dict()
+
+		# results can be shared with other callers, so their entries are copied rather than changed
+		for entry in result.payload:
+			path 				= os.path.abspath( os.path.join( self.root, entry.path ) )
+			statuses[ path ]	= StatusEntry( path, entry.item, entry.props, entry.revision, entry.tree_conflicted )
+
+		for path in paths:
+			self.forget( path )
+
+		self.statuses.update( statuses )
+		self.scanned_at = scanned_at
+
+		return True
+
+	def dirty_paths( self ):
+		paths 		= []
+		database	= WorkingCopyDatabase.for_path( self.root )
+
+		for path in sorted( self.dirty, key = len ):
+			if self.has_ancestor( path, paths ):
+				continue
+
+			# svn status errors out on paths that neither exist nor are versioned
+			if not os.path.lexists( path ) and not self.is_versioned( database, path ):
+				self.forget( path )
+				continue
+
+			paths.append( path )
+
+		if len( paths ) > MAX_DIRTY_PATHS:
+			return [ self.root ]
+
+		return paths
+
+	def has_ancestor( self, path, paths ):
+		for ancestor in paths:
+			if path == ancestor or path.startswith( ancestor + os.sep ):
+				return True
+
+		return False
+
+	def is_versioned( self, database, path ):
+		if path in self.statuses or database is None:
+			return True
+
+		try:
+			return database.node( path ) is not None
+		except WorkingCopyDatabaseError:
+			return True
+
+	def forget( self, path ):
+		if path == self.root:
+			self.statuses.clear()
+			return
+
+		prefix = path + os.sep
+
+		for status_path in [ status_path for status_path in self.statuses if status_path == path or status_path.startswith( prefix ) ]:
+			del self.statuses[ status_path ]
+
+	def snapshot( self ):
+		# the snapshot is saved from the UI thread on unload, a working copy in the middle of a scan keeps its last one
+		if not self.lock.acquire( False ):
+			return self.last_snapshot
+
+		try:
+			self.take_pending()
+
+			if not self.loaded or self.signature is None:
+				self.last_snapshot = None
+				return None
+
+			statuses	= [ [ os.path.relpath( entry.path, self.root ), entry.item, entry.props, entry.revision, entry.tree_conflicted ] for entry in self.statuses.values() ]
+			folders		= set( [ self.root ] + [ os.path.dirname( path ) for path in self.statuses ] )
+			mtimes		= dict()
+
+			for folder in folders:
+				try:
+					mtimes[ os.path.relpath( folder, self.root ) ] = os.path.getmtime( folder )
+				except OSError:
+					continue
+
+			self.last_snapshot = { 'signature': list( self.signature ), 'scanned_at': self.scanned_at, 'statuses': statuses, 'folders': mtimes,
+								   'dirty': [ os.path.relpath( path, self.root ) for path in self.dirty ] }
+
+			return self.last_snapshot
+		finally:
+			self.lock.release()
+
+	def restore( self, snapshot ):
+		with self.lock:
+			# anything svn did to the working copy since the snapshot was taken shows up in wc.db
+			if self.loaded or self.database_signature() != tuple( snapshot[ 'signature' ] ):
+				return False
+
+			for path, item, props, revision, tree_conflicted in snapshot[ 'statuses' ]:
+				path 					= os.path.normpath( os.path.join( self.root, path ) )
+				self.statuses[ path ]	= StatusEntry( path, item, props, revision, tree_conflicted )
+
+			for path in snapshot[ 'dirty' ]:
+				self.dirty.add( os.path.normpath( os.path.join( self.root, path ) ) )
+
+			# files added or removed while nothing was watching change the modification time of their folder,
+			# edited files are caught by check_stale against the restored scan time
+			for path, mtime in snapshot[ 'folders' ].items():
+				path = os.path.normpath( os.path.join( self.root, path ) )
+
+				try:
+					if os.path.getmtime( path ) != mtime:
+						self.dirty.add( path )
+				except OSError:
+					self.dirty.add( path )
+
+			self.scanned_at	= snapshot[ 'scanned_at' ]
+			self.signature	= tuple( snapshot[ 'signature' ] )
+			self.loaded		= True
+			self.verified	= False
+
+			return True
+
+	def check_stale( self, path ):
+		try:
+			if os.path.isfile( path ) and os.path.getmtime( path ) >= self.scanned_at:
+				self.dirty.add( path )
+		except OSError:
+			self.dirty.add( path )
+
+	def check_stale_tree( self, path ):
+		# watchers only see folders change, files edited in place show up through their modification time
+		if not os.path.isdir( path ):
+			self.check_stale( path )
+			return
+
+		for folder, folders, files in walk_directories( path ):
+			for name in files:
+				self.check_stale( os.path.join( folder, name ) )
+
+	def status( self, path ):
+		path = os.path.abspath( path )
+
+		with self.lock:
+			self.check_stale( path )
+
+			if not self.refresh():
+				return None
+
+			entry = self.statuses.get( path )
+
+			return None if entry is None else entry.item
+
+	def changes( self, path, exact = False ):
+		path 	= os.path.abspath( path )
+		prefix	= path + os.sep
+
+		with self.lock:
+			if exact:
+				self.check_stale_tree( path )
+			else:
+				self.check_stale( path )
+
+			if not self.refresh( exact ):
+				return None
+
+			return sorted( [ entry for status_path, entry in self.statuses.items() if status_path == path or status_path.startswith( prefix ) or path == self.root ], key = lambda entry: entry.path )
+
+	def is_modified( self, path, exact = False ):
+		changes = self.changes( path, exact )
+
+		if changes is None:
+			return None
+
+		for entry in changes:
+			if entry.item in MODIFIED_STATUSES:
+				return True
+
+		return False